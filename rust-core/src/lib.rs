@@ -19,6 +19,7 @@ pyo3::create_exception!(autodoc_core, RustAnalysisError, PyException);
 fn autodoc_core(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<PyCodeEntity>()?;
     m.add_class::<PyRustAnalyzer>()?;
+    m.add_function(wrap_pyfunction!(analyze_directory_rust, m)?)?;
     m.add("RustAnalysisError", m.py().get_type_bound::<RustAnalysisError>())?;
     Ok(())
 }
@@ -146,6 +147,58 @@ impl PyRustAnalyzer {
 
 
 
+/// Analyze a directory and return `autodoc.analyzer.CodeEntity` instances directly,
+/// so the Python side does no per-entity conversion
+#[pyfunction]
+#[pyo3(signature = (dir_path, exclude_patterns=None))]
+fn analyze_directory_rust(
+    py: Python<'_>,
+    dir_path: &str,
+    exclude_patterns: Option<Vec<String>>,
+) -> PyResult<Vec<PyObject>> {
+    let mut analyzer = RustAnalyzer::new();
+    if let Some(patterns) = &exclude_patterns {
+        let pattern_refs: Vec<&str> = patterns.iter().map(|s| s.as_str()).collect();
+        analyzer = analyzer.with_excludes(pattern_refs);
+    }
+
+    // Parsing is pure Rust, so let other Python threads run meanwhile
+    let entities = py
+        .allow_threads(|| analyzer.analyze_directory(Path::new(dir_path)))
+        .map_err(|e| RustAnalysisError::new_err(e.to_string()))?;
+
+    let entity_class = py.import_bound("autodoc.analyzer")?.getattr("CodeEntity")?;
+    let mut result = Vec::with_capacity(entities.len());
+    for entity in entities {
+        let mut decorators = entity.decorators;
+        if entity.is_async {
+            decorators.push("async".to_string());
+        }
+
+        let parameters = pyo3::types::PyList::empty_bound(py);
+        for name in &entity.parameters {
+            let param = pyo3::types::PyDict::new_bound(py);
+            param.set_item("name", name)?;
+            param.set_item("type", py.None())?;
+            parameters.append(param)?;
+        }
+
+        let kwargs = pyo3::types::PyDict::new_bound(py);
+        kwargs.set_item("type", entity.entity_type)?;
+        kwargs.set_item("name", entity.name)?;
+        kwargs.set_item("file_path", entity.file_path.to_string_lossy().into_owned())?;
+        kwargs.set_item("line_number", entity.line_number)?;
+        kwargs.set_item("docstring", entity.docstring)?;
+        kwargs.set_item("code", entity.code)?;
+        kwargs.set_item("decorators", decorators)?;
+        kwargs.set_item("parameters", parameters)?;
+        kwargs.set_item("response_type", entity.return_type)?;
+
+        result.push(entity_class.call((), Some(&kwargs))?.unbind());
+    }
+    Ok(result)
+}
+
 impl From<CodeEntity> for PyCodeEntity {
     fn from(entity: CodeEntity) -> Self {
         PyCodeEntity {
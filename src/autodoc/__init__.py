@@ -1,13 +1,17 @@
+from typing import TYPE_CHECKING
+
 from autodoc.__about__ import __version__
-from autodoc.sdk import (
-    AnalysisResult,
-    Autodoc,
-    ImpactResult,
-    Pack,
-    SearchResult,
-    SkillExportResult,
-    analyze,
-)
+
+if TYPE_CHECKING:
+    from autodoc.sdk import (
+        AnalysisResult,
+        Autodoc,
+        ImpactResult,
+        Pack,
+        SearchResult,
+        SkillExportResult,
+        analyze,
+    )
 
 __all__ = [
     "__version__",
@@ -19,3 +23,13 @@ __all__ = [
     "SkillExportResult",
     "analyze",
 ]
+
+
+def __getattr__(name):
+    # The SDK pulls in the analyzer and embedding stack, so load it on first access;
+    # this keeps submodule imports such as autodoc.cli from paying for it up front.
+    if name in __all__:
+        from autodoc import sdk
+
+        return getattr(sdk, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,7 +4,9 @@ AST analysis functionality for extracting code entities from Python files.
 
 import ast
 import re
+import sys
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -13,6 +15,42 @@ from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn
 
 console = Console()
 
+# Directory names skipped when walking a project for Python files
+DEFAULT_EXCLUDES = [
+    "__pycache__",
+    "venv",
+    ".venv",
+    "build",
+    "dist",
+    "node_modules",
+    ".git",
+    "test_install",
+    "lib",
+    "libs",
+    ".tox",
+    ".eggs",
+    "*.egg-info",
+]
+
+
+def is_excluded(
+    file_path: Path,
+    root: Path,
+    exclude_patterns: Optional[List[str]] = None,
+    default_excludes: List[str] = DEFAULT_EXCLUDES,
+) -> bool:
+    """Check whether a file under ``root`` is skipped by directory analysis.
+
+    A file is skipped if any part of its path below ``root`` is one of
+    ``default_excludes``, or if that relative path matches an exclude pattern.
+    """
+    relative_path = file_path.relative_to(root)
+    if any(skip in relative_path.parts for skip in default_excludes):
+        return True
+    return bool(exclude_patterns) and any(
+        relative_path.match(pattern) for pattern in exclude_patterns
+    )
+
 
 @dataclass
 class CodeEntity:
@@ -37,6 +75,15 @@ class CodeEntity:
     external_domain: Optional[str] = None
     external_calls: List[str] = field(default_factory=list)
 
+    @cached_property
+    def cache_key(self) -> str:
+        """Key identifying this entity in the enrichment cache.
+
+        Interned so lookups against the (also interned) loaded cache keys compare
+        by identity rather than character by character.
+        """
+        return sys.intern(f"{self.file_path}:{self.name}:{self.line_number}")
+
 
 class SimpleASTAnalyzer:
     """Analyzes Python files using AST to extract code entities."""
@@ -81,41 +128,7 @@ class SimpleASTAnalyzer:
         """Analyze all Python files in a directory."""
         console.print(f"[blue]Analyzing {path}...[/blue]")
 
-        # Default exclude patterns
-        default_excludes = [
-            "__pycache__",
-            "venv",
-            ".venv",
-            "build",
-            "dist",
-            "node_modules",
-            ".git",
-            "test_install",
-            "lib",
-            "libs",
-            ".tox",
-            ".eggs",
-            "*.egg-info",
-        ]
-
-        python_files = list(path.rglob("*.py"))
-
-        # Filter files
-        filtered_files = []
-        for f in python_files:
-            # Skip if in default exclude directories
-            if any(skip in f.parts for skip in default_excludes):
-                continue
-
-            # Skip if matches exclude patterns
-            if exclude_patterns:
-                relative_path = f.relative_to(path)
-                if any(relative_path.match(pattern) for pattern in exclude_patterns):
-                    continue
-
-            filtered_files.append(f)
-
-        python_files = filtered_files
+        python_files = [f for f in path.rglob("*.py") if not is_excluded(f, path, exclude_patterns)]
 
         console.print(f"Found {len(python_files)} Python files")
 
@@ -2,22 +2,34 @@
 Main Autodoc class that orchestrates code analysis and documentation generation.
 """
 
+import asyncio
+import heapq
 import json
 import os
+from collections import Counter
 from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
+import numpy as np
 from rich.console import Console
 
 from .analyzer import CodeEntity, SimpleASTAnalyzer
 from .chromadb_embedder import ChromaDBEmbedder
 from .config import AutodocConfig
-from .embedder import OpenAIEmbedder
+from .embedder import OpenAIEmbedder, dequantize_embedding, quantize_embedding
 from .project_analyzer import ProjectAnalyzer
 from .summary import CodeAnalyzer, MarkdownFormatter
 
+# Optional fast JSON codec for the entity cache
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Optional TypeScript analyzer import
 try:
     from .typescript_analyzer import TypeScriptAnalyzer
@@ -38,6 +50,11 @@ class SimpleAutodoc:
         self.ts_analyzer = None
         self.embedder = None
         self.chromadb_embedder = None
+        # Parsed imports keyed by (path, st_mtime_ns, st_size)
+        self._imports_cache: Dict[tuple, List[str]] = {}
+        # Search matrix built from self.entities, tagged with the (list, len) it came from
+        self._embedding_matrix_cache = None
+        self._embedding_matrix_source = (None, 0)
 
         # Initialize TypeScript analyzer if available
         if TYPESCRIPT_AVAILABLE:
@@ -89,7 +106,7 @@ class SimpleAutodoc:
         # Load existing entities if incremental
         existing_entities = []
         changed_files = set()
-        if incremental and Path("autodoc_cache.json").exists():
+        if incremental and os.path.exists("autodoc_cache.json"):
             self.load()
             existing_entities = self.entities.copy()
             console.print(
@@ -109,6 +126,8 @@ class SimpleAutodoc:
                 console.print("[green]No files have changed since last analysis[/green]")
                 return self._create_summary(existing_entities)
 
+        ts_available = bool(self.ts_analyzer and self.ts_analyzer.is_available())
+
         # Analyze Python files
         if incremental and changed_files:
             # Only analyze changed files
@@ -121,16 +140,33 @@ class SimpleAutodoc:
             # Keep entities from unchanged files
             unchanged_entities = [e for e in existing_entities if e.file_path not in changed_files]
             all_entities = unchanged_entities + python_entities
+        elif path.is_file():
+            # A single file needs neither a directory walk nor worker threads
+            python_entities, full_ts_entities = [], []
+            if path.suffix == ".py":
+                python_entities = self.analyzer.analyze_file(path)
+            elif ts_available and path.suffix in (".ts", ".tsx"):
+                full_ts_entities = self.ts_analyzer.analyze_file(path)
+            all_entities = python_entities.copy()
         else:
-            # Full analysis
-            python_entities = self.analyzer.analyze_directory(path, exclude_patterns)
+            # Full analysis: parse Python and TypeScript in worker threads so the
+            # event loop stays free while the CPU-bound AST work runs
+            if ts_available:
+                python_entities, full_ts_entities = await asyncio.gather(
+                    asyncio.to_thread(self.analyzer.analyze_directory, path, exclude_patterns),
+                    asyncio.to_thread(self.ts_analyzer.analyze_directory, path, exclude_patterns),
+                )
+            else:
+                python_entities = await asyncio.to_thread(
+                    self.analyzer.analyze_directory, path, exclude_patterns
+                )
             all_entities = (
                 python_entities.copy()
             )  # Create a copy to avoid modifying the original list
 
         # Analyze TypeScript files if analyzer is available
         typescript_entities = []
-        if self.ts_analyzer and self.ts_analyzer.is_available():
+        if ts_available:
             if incremental and changed_files:
                 # Only analyze changed TypeScript files
                 for file_path in changed_files:
@@ -146,8 +182,8 @@ class SimpleAutodoc:
                 ]
                 typescript_entities.extend(unchanged_ts_entities)
             else:
-                # Full analysis
-                typescript_entities = self.ts_analyzer.analyze_directory(path, exclude_patterns)
+                # Full analysis (already parsed alongside the Python files)
+                typescript_entities = full_ts_entities
             all_entities.extend(typescript_entities)
 
         console.print(
@@ -169,33 +205,8 @@ class SimpleAutodoc:
         elif self.embedder and all_entities:
             console.print("[blue]Generating OpenAI embeddings...[/blue]")
 
-            # Load enrichment cache if available
-            enrichment_cache = None
-            try:
-                from .enrichment import EnrichmentCache
-
-                enrichment_cache = EnrichmentCache()
-            except Exception:
-                pass
-
-            texts = []
-            for entity in all_entities:
-                text = f"{entity.type} {entity.name}"
-
-                # Use enriched description if available
-                if enrichment_cache:
-                    cache_key = f"{entity.file_path}:{entity.name}:{entity.line_number}"
-                    enrichment = enrichment_cache.get_enrichment(cache_key)
-                    if enrichment and enrichment.get("description"):
-                        text += f": {enrichment['description']}"
-                        if enrichment.get("key_features"):
-                            text += " Features: " + ", ".join(enrichment["key_features"])
-                    elif entity.docstring:
-                        text += f": {entity.docstring}"
-                elif entity.docstring:
-                    text += f": {entity.docstring}"
-
-                texts.append(text)
+            # Reading the enrichment cache and building texts is disk/CPU work
+            texts = await asyncio.to_thread(self.build_embedding_texts, all_entities)
 
             embeddings = await self.embedder.embed_batch(texts)
             for entity, embedding in zip(all_entities, embeddings):
@@ -213,6 +224,40 @@ class SimpleAutodoc:
 
         return self._create_summary(all_entities, python_entities, typescript_entities)
 
+    def build_embedding_texts(self, entities: List[CodeEntity], enrichment_cache=None) -> List[str]:
+        """Build embedding input texts, preferring enriched descriptions when cached.
+
+        Pass an already-loaded EnrichmentCache to skip reading it from disk again.
+        """
+        if enrichment_cache is None:
+            try:
+                from .enrichment import EnrichmentCache
+
+                enrichment_cache = EnrichmentCache()
+            except Exception:
+                pass
+        get_enrichment = enrichment_cache.get_enrichment if enrichment_cache else None
+
+        texts = []
+        for entity in entities:
+            parts = [entity.type, " ", entity.name]
+
+            # Use enriched description if available
+            enrichment = None
+            if get_enrichment:
+                cache_key = entity.cache_key
+                enrichment = get_enrichment(cache_key)
+            if enrichment and enrichment.get("description"):
+                parts += (": ", enrichment["description"])
+                if enrichment.get("key_features"):
+                    parts += (" Features: ", ", ".join(enrichment["key_features"]))
+            elif entity.docstring:
+                parts += (": ", entity.docstring)
+
+            texts.append("".join(parts))
+
+        return texts
+
     def _create_summary(
         self,
         all_entities: List[CodeEntity],
@@ -225,38 +270,63 @@ class SimpleAutodoc:
         if typescript_entities is None:
             typescript_entities = [e for e in all_entities if e.file_path.endswith((".ts", ".tsx"))]
 
-        # Calculate language-specific stats
-        python_files = len(set(e.file_path for e in python_entities))
-        typescript_files = len(set(e.file_path for e in typescript_entities))
+        # Count entity types and collect files in a single pass per entity list
+        type_counts, all_files = self._tally_entities(all_entities)
+        python_counts, python_files = self._tally_entities(python_entities)
+        typescript_counts, typescript_files = self._tally_entities(typescript_entities)
 
         return {
-            "files_analyzed": len(set(e.file_path for e in all_entities)),
+            "files_analyzed": len(all_files),
             "total_entities": len(all_entities),
-            "functions": len([e for e in all_entities if e.type == "function"]),
-            "classes": len([e for e in all_entities if e.type == "class"]),
-            "methods": len([e for e in all_entities if e.type == "method"]),
-            "interfaces": len([e for e in all_entities if e.type == "interface"]),
-            "types": len([e for e in all_entities if e.type == "type"]),
+            "functions": type_counts["function"],
+            "classes": type_counts["class"],
+            "methods": type_counts["method"],
+            "interfaces": type_counts["interface"],
+            "types": type_counts["type"],
             "has_embeddings": self.embedder is not None or self.chromadb_embedder is not None,
             "languages": {
                 "python": {
-                    "files": python_files,
+                    "files": len(python_files),
                     "entities": len(python_entities),
-                    "functions": len([e for e in python_entities if e.type == "function"]),
-                    "classes": len([e for e in python_entities if e.type == "class"]),
+                    "functions": python_counts["function"],
+                    "classes": python_counts["class"],
                 },
                 "typescript": {
-                    "files": typescript_files,
+                    "files": len(typescript_files),
                     "entities": len(typescript_entities),
-                    "functions": len([e for e in typescript_entities if e.type == "function"]),
-                    "classes": len([e for e in typescript_entities if e.type == "class"]),
-                    "methods": len([e for e in typescript_entities if e.type == "method"]),
-                    "interfaces": len([e for e in typescript_entities if e.type == "interface"]),
-                    "types": len([e for e in typescript_entities if e.type == "type"]),
+                    "functions": typescript_counts["function"],
+                    "classes": typescript_counts["class"],
+                    "methods": typescript_counts["method"],
+                    "interfaces": typescript_counts["interface"],
+                    "types": typescript_counts["type"],
                 },
             },
         }
 
+    @staticmethod
+    def _tally_entities(entities: List[CodeEntity]) -> Tuple[Counter, Set[str]]:
+        """Count entity types and collect the distinct file paths of an entity list."""
+        type_counts = Counter()
+        files = set()
+        for entity in entities:
+            type_counts[entity.type] += 1
+            files.add(entity.file_path)
+        return type_counts, files
+
+    @staticmethod
+    def _search_result_entity(entity: CodeEntity) -> Dict[str, Any]:
+        """Shallow dict of the entity fields search callers read (no embedding copy)."""
+        return {
+            "type": entity.type,
+            "name": entity.name,
+            "file_path": entity.file_path,
+            "line_number": entity.line_number,
+            "docstring": entity.docstring,
+            "code": entity.code,
+            "embedding": None,
+            "is_internal": entity.is_internal,
+        }
+
     async def search(
         self,
         query: str,
@@ -280,8 +350,9 @@ class SimpleAutodoc:
             results = await self.search_async(query, limit, type_filter, file_filter, use_regex)
             formatted_results = []
             for entity, similarity in results:
-                entity_dict = asdict(entity)
-                formatted_results.append({"entity": entity_dict, "similarity": similarity})
+                formatted_results.append(
+                    {"entity": self._search_result_entity(entity), "similarity": similarity}
+                )
             return formatted_results
 
         # Otherwise use ChromaDB search if available
@@ -370,6 +441,25 @@ class SimpleAutodoc:
             "has_embeddings": self.embedder is not None or self.chromadb_embedder is not None,
         }
 
+    def _embedding_matrix(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return entity embeddings as one contiguous float32 matrix plus a presence mask.
+
+        Row ``i`` belongs to ``self.entities[i]``. The matrix is rebuilt only when
+        the entity list is replaced or resized.
+        """
+        source, size = self._embedding_matrix_source
+        if source is not self.entities or size != len(self.entities):
+            dim = next((len(e.embedding) for e in self.entities if e.embedding), 0)
+            matrix = np.zeros((len(self.entities), dim), dtype=np.float32)
+            present = np.zeros(len(self.entities), dtype=bool)
+            for i, entity in enumerate(self.entities):
+                if entity.embedding and len(entity.embedding) == dim:
+                    matrix[i] = entity.embedding
+                    present[i] = True
+            self._embedding_matrix_cache = (matrix, present)
+            self._embedding_matrix_source = (self.entities, len(self.entities))
+        return self._embedding_matrix_cache
+
     async def search_async(
         self,
         query: str,
@@ -390,33 +480,43 @@ class SimpleAutodoc:
         if not self.entities:
             return []
 
-        # Apply type and file filters first
-        filtered_entities = self.entities
+        # Apply type and file filters first, keeping each entity's row index
+        entities = self.entities
+        indices = range(len(entities))
 
         if type_filter:
-            filtered_entities = [e for e in filtered_entities if e.type == type_filter]
+            indices = [i for i in indices if entities[i].type == type_filter]
 
         if file_filter:
             import fnmatch
 
-            filtered_entities = [
-                e for e in filtered_entities if fnmatch.fnmatch(e.file_path, file_filter)
-            ]
+            indices = [i for i in indices if fnmatch.fnmatch(entities[i].file_path, file_filter)]
 
-        if not filtered_entities:
+        if not indices:
             return []
 
-        if self.embedder and all(e.embedding for e in filtered_entities):
+        filtered_entities = [entities[i] for i in indices]
+
+        use_embeddings = False
+        if self.embedder:
+            matrix, present = self._embedding_matrix()
+            rows = np.asarray(indices, dtype=np.intp)
+            use_embeddings = bool(present[rows].all())
+
+        if use_embeddings:
             console.print(f"[blue]Searching for: {query}[/blue]")
             query_embedding = await self.embedder.embed(query)
 
-            results = []
-            for entity in filtered_entities:
-                similarity = sum(a * b for a, b in zip(query_embedding, entity.embedding))
-                results.append((entity, similarity))
+            # Embeddings are L2-normalized by the embedder, so the dot product is cosine
+            scores = matrix[rows] @ np.asarray(query_embedding, dtype=np.float32)
 
-            results.sort(key=lambda x: x[1], reverse=True)
-            return results[:limit]
+            # Select the top-k without sorting every candidate
+            if limit < len(scores):
+                top = np.argpartition(-scores, limit)[:limit]
+            else:
+                top = np.arange(len(scores))
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [(filtered_entities[i], float(scores[i])) for i in top]
         else:
             # Text-based search with optional regex
             results = []
@@ -443,9 +543,8 @@ class SimpleAutodoc:
                     elif entity.docstring and query_lower in entity.docstring.lower():
                         results.append((entity, 0.5))
 
-            # Sort by score and limit results
-            results.sort(key=lambda x: x[1], reverse=True)
-            return results[:limit]
+            # Keep the highest-scoring results without a full sort
+            return heapq.nlargest(limit, results, key=lambda x: x[1])
 
     def save(self, path: str = "autodoc_cache.json", create_backup: bool = True):
         """Save analyzed entities to cache file."""
@@ -459,28 +558,60 @@ class SimpleAutodoc:
             except Exception as e:
                 console.print(f"[yellow]Warning: Could not create backup: {e}[/yellow]")
 
-        data = {"entities": [asdict(e) for e in self.entities]}
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2)
+        quantize = self.config.embeddings.cache_quantization == "int8"
+        entities_data = []
+        for entity in self.entities:
+            entity_data = asdict(entity)
+            if quantize and entity.embedding:
+                entity_data["embedding"], entity_data["embedding_scale"] = quantize_embedding(
+                    entity.embedding
+                )
+            entities_data.append(entity_data)
+
+        # Write to a temporary file and swap it in, so a concurrent load (e.g. the
+        # next watch-mode analysis) never reads a half-written cache
+        data = {"entities": entities_data}
+        tmp_path = f"{path}.tmp"
+        try:
+            if ORJSON_AVAILABLE:
+                with open(tmp_path, "wb") as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(tmp_path, "w") as f:
+                    json.dump(data, f, indent=2)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
         console.print(f"[green]Saved {len(self.entities)} entities to {path}[/green]")
 
+    def load_from_dict(self, data: Dict[str, Any]):
+        """Load analyzed entities from already-parsed cache data."""
+        # Filter entity data to only include fields that CodeEntity accepts
+        from inspect import signature
+
+        valid_fields = set(signature(CodeEntity).parameters.keys())
+
+        # Publish the list only once it is complete; watch mode may save concurrently
+        entities = []
+        for entity_data in data["entities"]:
+            # Only keep fields that exist in CodeEntity
+            filtered_data = {k: v for k, v in entity_data.items() if k in valid_fields}
+            # Quantized embeddings carry their scale alongside the int8 values
+            if entity_data.get("embedding_scale") is not None and entity_data.get("embedding"):
+                filtered_data["embedding"] = dequantize_embedding(
+                    entity_data["embedding"], entity_data["embedding_scale"]
+                )
+            entities.append(CodeEntity(**filtered_data))
+        self.entities = entities
+
     def load(self, path: str = "autodoc_cache.json"):
         """Load analyzed entities from cache file."""
         try:
-            with open(path, "r") as f:
-                data = json.load(f)
-
-            # Filter entity data to only include fields that CodeEntity accepts
-            from inspect import signature
-
-            valid_fields = set(signature(CodeEntity).parameters.keys())
-
-            self.entities = []
-            for entity_data in data["entities"]:
-                # Only keep fields that exist in CodeEntity
-                filtered_data = {k: v for k, v in entity_data.items() if k in valid_fields}
-                self.entities.append(CodeEntity(**filtered_data))
-
+            with open(path, "rb") as f:
+                raw = f.read()
+            data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+            self.load_from_dict(data)
             console.print(f"[green]Loaded {len(self.entities)} entities from {path}[/green]")
         except FileNotFoundError:
             console.print(f"[yellow]No cache file found at {path}[/yellow]")
@@ -497,6 +628,15 @@ class SimpleAutodoc:
 
             enrichment_cache = EnrichmentCache()
 
+        # Fetch every enrichment we need once, up front
+        enrich_map = {}
+        if enrichment_cache:
+            for entity in self.entities:
+                if entity.type in ("function", "class"):
+                    cache_key = entity.cache_key
+                    if cache_key not in enrich_map:
+                        enrich_map[cache_key] = enrichment_cache.get_enrichment(cache_key)
+
         # Initialize analyzers
         code_analyzer = CodeAnalyzer(self.entities)
         project_analyzer = ProjectAnalyzer(self.entities)
@@ -520,12 +660,7 @@ class SimpleAutodoc:
 
             if entity.type == "function":
                 # Get enrichment if available
-                enriched_data = {}
-                if enrichment_cache:
-                    cache_key = f"{entity.file_path}:{entity.name}:{entity.line_number}"
-                    enrichment = enrichment_cache.get_enrichment(cache_key)
-                    if enrichment:
-                        enriched_data = enrichment
+                enriched_data = enrich_map.get(entity.cache_key) or {}
 
                 func_info = {
                     "name": entity.name,
@@ -555,12 +690,7 @@ class SimpleAutodoc:
 
             elif entity.type == "class":
                 # Get enrichment if available
-                enriched_data = {}
-                if enrichment_cache:
-                    cache_key = f"{entity.file_path}:{entity.name}:{entity.line_number}"
-                    enrichment = enrichment_cache.get_enrichment(cache_key)
-                    if enrichment:
-                        enriched_data = enrichment
+                enriched_data = enrich_map.get(entity.cache_key) or {}
 
                 class_info = {
                     "name": entity.name,
@@ -603,7 +733,7 @@ class SimpleAutodoc:
             )
 
         # Build comprehensive analysis
-        dependencies = self._analyze_dependencies(files)
+        dependencies = self._analyze_dependencies(files, code_analyzer)
         feature_map = code_analyzer.build_enhanced_feature_map()
         key_functions = code_analyzer.identify_key_functions()
         class_hierarchy = self._build_detailed_class_hierarchy(code_analyzer)
@@ -683,10 +813,17 @@ class SimpleAutodoc:
         formatter = MarkdownFormatter()
         return formatter.format_summary_markdown(summary)
 
-    def _analyze_dependencies(self, files: Dict[str, Any]) -> Dict[str, Any]:
+    def iter_summary_markdown(self, summary: Dict[str, Any]) -> Iterator[str]:
+        """Yield the Markdown summary in chunks that concatenate to format_summary_markdown."""
+        lines = MarkdownFormatter().format_summary_markdown_lines(summary)
+        for i, line in enumerate(lines):
+            yield line if i == 0 else f"\n{line}"
+
+    def _analyze_dependencies(
+        self, files: Dict[str, Any], code_analyzer: CodeAnalyzer
+    ) -> Dict[str, Any]:
         """Analyze module dependencies."""
         dependencies = {}
-        code_analyzer = CodeAnalyzer(self.entities)
 
         for file_path, content in files.items():
             module_name = code_analyzer.path_to_module(file_path)
@@ -728,22 +865,22 @@ class SimpleAutodoc:
             "organization_score": 0,
         }
 
-        # Analyze directory structure
-        for file_path in files.keys():
-            path = Path(file_path)
-            dir_name = str(path.parent)
+        # Analyze directory structure and file types in one pass over plain strings
+        directories = structure["directories"]
+        file_types = structure["file_types"]
+        for file_path, file_data in files.items():
+            dir_name = os.path.dirname(file_path) or "."
 
-            if dir_name not in structure["directories"]:
-                structure["directories"][dir_name] = {"file_count": 0, "functions": 0, "classes": 0}
+            dir_stats = directories.get(dir_name)
+            if dir_stats is None:
+                dir_stats = directories[dir_name] = {"file_count": 0, "functions": 0, "classes": 0}
 
-            structure["directories"][dir_name]["file_count"] += 1
-            structure["directories"][dir_name]["functions"] += len(files[file_path]["functions"])
-            structure["directories"][dir_name]["classes"] += len(files[file_path]["classes"])
+            dir_stats["file_count"] += 1
+            dir_stats["functions"] += len(file_data["functions"])
+            dir_stats["classes"] += len(file_data["classes"])
 
-        # Analyze file types
-        for file_path in files.keys():
-            ext = Path(file_path).suffix
-            structure["file_types"][ext] = structure["file_types"].get(ext, 0) + 1
+            ext = os.path.splitext(file_path)[1]
+            file_types[ext] = file_types.get(ext, 0) + 1
 
         return structure
 
@@ -828,7 +965,21 @@ class SimpleAutodoc:
         return methods
 
     def _extract_imports(self, file_path: str) -> List[str]:
-        """Extract import statements from a file."""
+        """Extract import statements from a file, memoized on mtime and size."""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return self._parse_imports(file_path)
+
+        key = (file_path, st.st_mtime_ns, st.st_size)
+        imports = self._imports_cache.get(key)
+        if imports is None:
+            imports = self._parse_imports(file_path)
+            self._imports_cache[key] = imports
+        return list(imports)
+
+    def _parse_imports(self, file_path: str) -> List[str]:
+        """Parse import statements from a file."""
         try:
             with open(file_path, "r", encoding="utf-8") as f:
                 content = f.read()
@@ -838,7 +989,11 @@ class SimpleAutodoc:
             tree = ast.parse(content)
             imports = []
 
-            for node in ast.walk(tree):
+            # Imports live at module scope or under module-level if/try blocks,
+            # so only those statement lists are visited (in source order).
+            stack = list(reversed(tree.body))
+            while stack:
+                node = stack.pop()
                 if isinstance(node, ast.Import):
                     for alias in node.names:
                         imports.append(f"import {alias.name}")
@@ -846,6 +1001,13 @@ class SimpleAutodoc:
                     module = node.module or ""
                     for alias in node.names:
                         imports.append(f"from {module} import {alias.name}")
+                elif isinstance(node, ast.If):
+                    stack.extend(reversed(node.body + node.orelse))
+                elif isinstance(node, ast.Try):
+                    nested = node.body + node.orelse + node.finalbody
+                    for handler in node.handlers:
+                        nested += handler.body
+                    stack.extend(reversed(nested))
 
             return imports
         except Exception as e:
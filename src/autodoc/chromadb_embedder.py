@@ -82,7 +82,7 @@ class ChromaDBEmbedder:
 
         # Use enriched description if available
         if enrichment_cache:
-            cache_key = f"{entity.file_path}:{entity.name}:{entity.line_number}"
+            cache_key = entity.cache_key
             enrichment = enrichment_cache.get_enrichment(cache_key)
             if enrichment and enrichment.get("description"):
                 text += f": {enrichment['description']}"
@@ -151,7 +151,7 @@ class ChromaDBEmbedder:
 
                 # Add enrichment metadata if available
                 if enrichment_cache:
-                    cache_key = f"{entity.file_path}:{entity.name}:{entity.line_number}"
+                    cache_key = entity.cache_key
                     enrichment = enrichment_cache.get_enrichment(cache_key)
                     if enrichment:
                         metadata["is_enriched"] = True
@@ -2,47 +2,214 @@
 Command-line interface for Autodoc.
 """
 
-import asyncio
+import atexit
+import functools
+import importlib
+import importlib.util
+import itertools
 import json
 import os
+import re
+import sys
+import threading
+from collections import Counter
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
-from rich.console import Console
-from rich.table import Table
 
-from .autodoc import SimpleAutodoc
-from .config import AutodocConfig, ContextPackConfig
-from .enrichment import EnrichmentCache, LLMEnricher
-from .inline_enrichment import InlineEnricher, ModuleEnrichmentGenerator
+if TYPE_CHECKING:
+    from .config import AutodocConfig
 
-# Optional graph imports - only available if dependencies are installed
+# Optional fast JSON codec for caches and JSON output
 try:
-    from .graph import CodeGraphBuilder, CodeGraphQuery, CodeGraphVisualizer
+    import orjson
 
-    GRAPH_AVAILABLE = True
-except ImportError as e:
-    # Check if it's a specific import error or all dependencies missing
-    import importlib.util
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-    deps_available = all(
-        importlib.util.find_spec(dep) is not None
-        for dep in ["matplotlib", "plotly", "neo4j", "networkx", "pyvis"]
-    )
-    if deps_available:
-        # Dependencies are installed but there's another import issue
-        print(f"Warning: Graph dependencies installed but import failed: {e}")
-    GRAPH_AVAILABLE = False
+# Graph features need optional dependencies; detect them without importing them
+GRAPH_DEPENDENCIES = ("matplotlib", "plotly", "neo4j", "networkx", "pyvis")
+GRAPH_AVAILABLE = all(importlib.util.find_spec(dep) is not None for dep in GRAPH_DEPENDENCIES)
 
-# Local graph visualization (works without Neo4j)
-try:
-    from .local_graph import LocalCodeGraph  # noqa: F401
+# Faster event loop for async commands, imported only when a command needs it
+UVLOOP_AVAILABLE = importlib.util.find_spec("uvloop") is not None
+
+# Output formats shared by the documentation commands' --format options
+_FORMAT_CHOICES = click.Choice(("markdown", "json"))
+
+# Function calls like func_name( or self.func_name( in test code, used by test-map
+_CALL_RE = re.compile(r"(?:self\.)?\b(\w+)\s*\(")
+
+
+def _load_graph() -> bool:
+    """Import the Neo4j graph classes on first use and report whether they are available."""
+    global GRAPH_AVAILABLE, CodeGraphBuilder, CodeGraphQuery, CodeGraphVisualizer
+
+    if GRAPH_AVAILABLE and "CodeGraphBuilder" not in globals():
+        try:
+            from .graph import CodeGraphBuilder, CodeGraphQuery, CodeGraphVisualizer
+        except ImportError as e:
+            # Dependencies are installed but there's another import issue
+            print(f"Warning: Graph dependencies installed but import failed: {e}")
+            GRAPH_AVAILABLE = False
+    return GRAPH_AVAILABLE
+
+
+class _LazyConsole:
+    """Stand-in for the shared Rich console that imports Rich on first use."""
+
+    def __init__(self):
+        self._console = None
+
+    def __getattr__(self, name):
+        global console
+        if self._console is None:
+            from rich.console import Console
+
+            # Probe the terminal once; status lines are templated, so skip auto-highlighting
+            self._console = Console(force_terminal=sys.stdout.isatty(), highlight=False)
+        # Later lookups of the module global go straight to the real console
+        console = self._console
+        return getattr(self._console, name)
+
+
+console = _LazyConsole()
+
+
+def _parse_json(raw: bytes):
+    """Parse JSON bytes, using orjson when it is installed."""
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def _dump_json(obj) -> bytes:
+    """Serialize to indented JSON bytes, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
 
-    LOCAL_GRAPH_AVAILABLE = True
-except ImportError:
-    LOCAL_GRAPH_AVAILABLE = False
 
-console = Console()
+def _read_json(path):
+    """Load a JSON file, parsing with orjson when it is installed."""
+    with open(path, "rb") as f:
+        return _parse_json(f.read())
+
+
+def _cache_exists(path: str = "autodoc_cache.json") -> bool:
+    """Return True if the analysis cache file exists, using a single stat call."""
+    try:
+        os.stat(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _cwd_names() -> set:
+    """Return the entry names in the current directory from a single scandir call."""
+    with os.scandir(".") as it:
+        return {entry.name for entry in it}
+
+
+# Config file names AutodocConfig.load() looks for in the working directory
+_CONFIG_FILES = (".autodoc.yml", ".autodoc.yaml", "autodoc.yml", "autodoc.yaml")
+
+
+def _file_stamps(*paths) -> tuple:
+    """Return (st_mtime_ns, st_size) for each path, or None where a path is missing."""
+    stamps = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            stamps.append(None)
+        else:
+            stamps.append((st.st_mtime_ns, st.st_size))
+    return tuple(stamps)
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_config(cwd, stamps):
+    from .config import AutodocConfig
+
+    return AutodocConfig.load()
+
+
+def _config() -> "AutodocConfig":
+    """Return the project config, reused while the cwd and its config files are unchanged."""
+    return _cached_config(os.getcwd(), _file_stamps(*_CONFIG_FILES))
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_autodoc(cwd, stamps, api_key):
+    from .autodoc import SimpleAutodoc
+
+    autodoc = SimpleAutodoc(config=_config())
+    autodoc.load()
+    return autodoc
+
+
+def _autodoc():
+    """Return a SimpleAutodoc loaded from the cache, reused while its inputs are unchanged.
+
+    Repeated commands in one process (tests, REPL sessions) skip re-parsing the
+    cache until the cache or config files change or OPENAI_API_KEY is updated.
+    Callers must treat the instance as read-only.
+    """
+    stamps = _file_stamps("autodoc_cache.json", *_CONFIG_FILES)
+    return _cached_autodoc(os.getcwd(), stamps, os.getenv("OPENAI_API_KEY"))
+
+
+def _prewarm(*modules):
+    """Import modules on a daemon thread so they are cached by the time a command needs them."""
+
+    def _import_all():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+
+    threading.Thread(target=_import_all, daemon=True).start()
+
+
+_runner = None
+
+
+def _get_runner():
+    """Return the process-wide asyncio.Runner, creating it on first use (Python 3.11+)."""
+    global _runner
+    if _runner is None:
+        import asyncio
+
+        loop_factory = None
+        if UVLOOP_AVAILABLE:
+            import uvloop
+
+            loop_factory = uvloop.new_event_loop
+        _runner = asyncio.Runner(loop_factory=loop_factory)
+        atexit.register(_close_runner)
+    return _runner
+
+
+def _close_runner():
+    # Runner.close() would start a thread to drain the default executor, which is
+    # no longer allowed at interpreter shutdown; closing the loop is enough here.
+    if _runner is not None:
+        _runner.get_loop().close()
+
+
+def _run_async(coro):
+    """Run a coroutine to completion, reusing one event loop (uvloop when installed)."""
+    import asyncio
+
+    if hasattr(asyncio, "Runner"):
+        return _get_runner().run(coro)
+    if UVLOOP_AVAILABLE:
+        import uvloop
+
+        return uvloop.run(coro)
+    return asyncio.run(coro)
 
 
 @click.group()
@@ -59,7 +226,7 @@ def cli():
 
 
 @cli.command()
-@click.argument("path", type=click.Path(exists=True), default=".")
+@click.argument("path", type=click.Path(exists=True, path_type=Path), default=".")
 @click.option("--save", is_flag=True, help="Save analysis to cache")
 @click.option("--incremental", is_flag=True, help="Only analyze changed files")
 @click.option(
@@ -70,6 +237,8 @@ def cli():
 @click.option("--rebuild-packs", is_flag=True, help="Rebuild pack caches after analysis (keeps line numbers in sync)")
 def analyze(path, save, incremental, exclude, watch, rust, rebuild_packs):
     """Analyze a codebase"""
+    from .autodoc import SimpleAutodoc
+
     autodoc = SimpleAutodoc()
 
     if watch:
@@ -77,7 +246,8 @@ def analyze(path, save, incremental, exclude, watch, rust, rebuild_packs):
         console.print("[blue]Starting watch mode. Press Ctrl+C to stop.[/blue]")
         _run_watch_mode(autodoc, path, save, exclude)
     else:
-        # Single analysis
+        # Single analysis; the summary table is only rendered once analysis finishes
+        _prewarm("rich.table")
         if rust:
             # Use Rust analyzer for Python files
             console.print("[green]Using high-performance Rust analyzer...[/green]")
@@ -88,17 +258,11 @@ def analyze(path, save, incremental, exclude, watch, rust, rebuild_packs):
                 return
         else:
             # Use regular Python analyzer
-            # Run async function in event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                summary = loop.run_until_complete(
-                    autodoc.analyze_directory(
-                        Path(path), incremental=incremental, exclude_patterns=list(exclude)
-                    )
+            summary = _run_async(
+                autodoc.analyze_directory(
+                    path, incremental=incremental, exclude_patterns=list(exclude)
                 )
-            finally:
-                loop.close()
+            )
 
         _display_summary(summary)
 
@@ -119,7 +283,7 @@ def _rebuild_pack_caches():
     import fnmatch
     from pathlib import Path as PathLib
 
-    config = AutodocConfig.load()
+    config = _config()
 
     if not config.context_packs:
         console.print("[dim]No packs configured, skipping rebuild[/dim]")
@@ -204,8 +368,7 @@ def _rebuild_pack_caches():
             "llm_summary": existing_data.get("llm_summary"),
         }
 
-        with open(pack_file, "w") as f:
-            json.dump(pack_data, f, indent=2)
+        pack_file.write_bytes(_dump_json(pack_data))
 
         rebuilt_count += 1
 
@@ -216,61 +379,38 @@ def _analyze_with_rust(autodoc, path, exclude_patterns):
     """Analyze using Rust core."""
     import autodoc_core
 
-    from .analyzer import CodeEntity
-
-    # Get all entities from Rust
-    rust_entities = autodoc_core.analyze_directory_rust(
+    # The Rust core builds CodeEntity objects itself, so there is no per-entity conversion here
+    entities = autodoc_core.analyze_directory_rust(
         str(path), list(exclude_patterns) if exclude_patterns else None
     )
 
-    # Convert Rust entities to our CodeEntity format
-    entities = []
-    for rust_entity in rust_entities:
-        # Convert parameters from list of strings to list of dicts
-        params = []
-        for param_name in rust_entity.parameters:
-            params.append({"name": param_name, "type": None})
-
-        entity = CodeEntity(
-            type=rust_entity.entity_type,
-            name=rust_entity.name,
-            file_path=rust_entity.file_path,
-            line_number=rust_entity.line_number,
-            docstring=rust_entity.docstring,
-            code=rust_entity.code,
-            decorators=rust_entity.decorators,
-            parameters=params,
-        )
-
-        # Add async info to decorators if needed
-        if rust_entity.is_async:
-            entity.decorators.append("async")
-
-        # Store return type in response_type field
-        if rust_entity.return_type:
-            entity.response_type = rust_entity.return_type
-
-        entities.append(entity)
-
     # Store entities in autodoc
     autodoc.entities = entities
 
+    # Tally entity types and files in a single pass
+    type_counts = Counter()
+    files = set()
+    for e in entities:
+        type_counts[e.type] += 1
+        files.add(e.file_path)
+    n_files = len(files)
+
     # Calculate summary
     summary = {
-        "files_analyzed": len(set(e.file_path for e in entities)),
+        "files_analyzed": n_files,
         "total_entities": len(entities),
-        "functions": sum(1 for e in entities if e.type == "function"),
-        "classes": sum(1 for e in entities if e.type == "class"),
-        "methods": sum(1 for e in entities if e.type == "method"),
+        "functions": type_counts["function"],
+        "classes": type_counts["class"],
+        "methods": type_counts["method"],
         "interfaces": 0,
         "types": 0,
         "has_embeddings": False,
         "languages": {
             "python": {
-                "files": len(set(e.file_path for e in entities)),
+                "files": n_files,
                 "entities": len(entities),
-                "functions": sum(1 for e in entities if e.type == "function"),
-                "classes": sum(1 for e in entities if e.type == "class"),
+                "functions": type_counts["function"],
+                "classes": type_counts["class"],
             },
             "typescript": {
                 "files": 0,
@@ -287,51 +427,63 @@ def _analyze_with_rust(autodoc, path, exclude_patterns):
     return summary
 
 
+# (label, summary key) rows shown by _display_summary; optional rows only when > 0
+_SUMMARY_ROWS = (
+    ("Files analyzed", "files_analyzed"),
+    ("Total entities", "total_entities"),
+    ("Functions", "functions"),
+    ("Classes", "classes"),
+)
+_OPTIONAL_SUMMARY_ROWS = (("Methods", "methods"), ("Interfaces", "interfaces"), ("Types", "types"))
+_LANGUAGE_SUMMARY_ROWS = (
+    ("python", "Python", ("files", "entities", "functions", "classes")),
+    (
+        "typescript",
+        "TypeScript",
+        ("files", "entities", "functions", "classes", "methods", "interfaces", "types"),
+    ),
+)
+
+
 def _display_summary(summary):
     """Display analysis summary."""
-    console.print("\n[bold]Analysis Summary:[/bold]")
-
-    # Display overall stats
-    console.print(f"  Files analyzed: {summary['files_analyzed']}")
-    console.print(f"  Total entities: {summary['total_entities']}")
-    console.print(f"  Functions: {summary['functions']}")
-    console.print(f"  Classes: {summary['classes']}")
-
-    if summary.get("methods", 0) > 0:
-        console.print(f"  Methods: {summary['methods']}")
-    if summary.get("interfaces", 0) > 0:
-        console.print(f"  Interfaces: {summary['interfaces']}")
-    if summary.get("types", 0) > 0:
-        console.print(f"  Types: {summary['types']}")
-
-    console.print(f"  Embeddings: {'enabled' if summary['has_embeddings'] else 'disabled'}")
-
-    # Display language-specific stats
-    if "languages" in summary:
-        languages = summary["languages"]
-
-        if languages["python"]["entities"] > 0:
-            console.print("\n[bold]Python:[/bold]")
-            console.print(f"  Files: {languages['python']['files']}")
-            console.print(f"  Entities: {languages['python']['entities']}")
-            console.print(f"  Functions: {languages['python']['functions']}")
-            console.print(f"  Classes: {languages['python']['classes']}")
-
-        if languages["typescript"]["entities"] > 0:
-            console.print("\n[bold]TypeScript:[/bold]")
-            console.print(f"  Files: {languages['typescript']['files']}")
-            console.print(f"  Entities: {languages['typescript']['entities']}")
-            console.print(f"  Functions: {languages['typescript']['functions']}")
-            console.print(f"  Classes: {languages['typescript']['classes']}")
-            console.print(f"  Methods: {languages['typescript']['methods']}")
-            console.print(f"  Interfaces: {languages['typescript']['interfaces']}")
-            console.print(f"  Types: {languages['typescript']['types']}")
+    from rich.table import Table
+
+    table = Table(show_header=False, box=None, padding=(0, 1, 0, 0))
+    table.add_column("Label")
+    table.add_column("Value")
+
+    # Overall stats
+    for label, key in _SUMMARY_ROWS:
+        table.add_row(f"  {label}:", str(summary[key]))
+    for label, key in _OPTIONAL_SUMMARY_ROWS:
+        if summary.get(key, 0) > 0:
+            table.add_row(f"  {label}:", str(summary[key]))
+    table.add_row("  Embeddings:", "enabled" if summary["has_embeddings"] else "disabled")
+
+    # Language-specific stats
+    languages = summary.get("languages", {})
+    for lang, title, keys in _LANGUAGE_SUMMARY_ROWS:
+        stats = languages.get(lang)
+        if not stats or stats["entities"] <= 0:
+            continue
+        table.add_row("", "")
+        table.add_row(f"[bold]{title}:[/bold]", "")
+        for key in keys:
+            table.add_row(f"  {key.capitalize()}:", str(stats[key]))
+
+    # One print call renders the heading and the table under a single console lock
+    console.print("\n[bold]Analysis Summary:[/bold]", table)
 
 
 def _run_watch_mode(autodoc, path, save, exclude):
     """Run analysis in watch mode."""
+    import asyncio
     import time
 
+    from .analyzer import DEFAULT_EXCLUDES, is_excluded
+    from .typescript_analyzer import TS_DEFAULT_EXCLUDES
+
     try:
         from watchdog.events import FileSystemEventHandler
         from watchdog.observers import Observer
@@ -340,70 +492,143 @@ def _run_watch_mode(autodoc, path, save, exclude):
         console.print("[yellow]Install with: pip install watchdog[/yellow]")
         return
 
+    root = Path(path).resolve()
+
     class CodeChangeHandler(FileSystemEventHandler):
+        """Collect change events and run one analysis per burst of saves."""
+
         def __init__(self):
-            self.last_modified = {}
             self.debounce_seconds = 1.0
+            self.pending = set()
+            self._timer = None
+            self._lock = threading.Lock()
+            # Held while an analysis runs so flushes never overlap
+            self._analysis_lock = threading.Lock()
+            # Cache writes run on the watch loop; newer requests fold into the running one
+            self._save_requested = False
+            self._saving = False
+            self._save_future = None
 
         def should_process(self, file_path):
             """Check if file should be processed."""
-            if not file_path.endswith((".py", ".ts", ".tsx")):
+            if file_path.endswith(".py"):
+                default_excludes = DEFAULT_EXCLUDES
+            elif file_path.endswith((".ts", ".tsx")):
+                default_excludes = TS_DEFAULT_EXCLUDES
+            else:
                 return False
 
-            # Check debounce
-            now = time.time()
-            last = self.last_modified.get(file_path, 0)
-            if now - last < self.debounce_seconds:
+            # Skip files the analyzers would skip rather than waking an analysis for them
+            try:
+                return not is_excluded(
+                    Path(file_path).resolve(), root, list(exclude), default_excludes
+                )
+            except ValueError:
+                # Outside the watched tree (e.g. reached through a symlink)
                 return False
 
-            self.last_modified[file_path] = now
-            return True
-
         def on_modified(self, event):
-            if event.is_directory:
+            if event.is_directory or not self.should_process(event.src_path):
+                return
+
+            # Editors fire several events per save; restart the timer so the burst
+            # is coalesced into a single analysis once it goes quiet
+            with self._lock:
+                self.pending.add(event.src_path)
+                if self._timer is not None:
+                    self._timer.cancel()
+                self._timer = threading.Timer(self.debounce_seconds, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        def cancel(self):
+            """Drop any pending batch and wait for running analysis and cache writes."""
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                self.pending.clear()
+            with self._analysis_lock:
+                save_future = self._save_future
+            if save_future is not None:
+                save_future.result()
+
+        def _request_save(self):
+            """Write the cache in the background, coalescing requests made during a write."""
+            with self._lock:
+                self._save_requested = True
+                if self._saving:
+                    return
+                self._saving = True
+                self._save_future = asyncio.run_coroutine_threadsafe(self._save_latest(), loop)
+
+        async def _save_latest(self):
+            while True:
+                with self._lock:
+                    if not self._save_requested:
+                        self._saving = False
+                        return
+                    self._save_requested = False
+                try:
+                    await asyncio.to_thread(autodoc.save)
+                    console.print("[green]✅ Cache updated[/green]")
+                except Exception as e:
+                    console.print(f"[red]Error saving cache: {e}[/red]")
+
+        def _flush(self):
+            with self._lock:
+                changed = sorted(self.pending)
+                self.pending.clear()
+                self._timer = None
+            if not changed:
                 return
 
-            if self.should_process(event.src_path):
-                console.print(f"\n[yellow]Detected change in {event.src_path}[/yellow]")
+            with self._analysis_lock:
+                if len(changed) == 1:
+                    console.print(f"\n[yellow]Detected change in {changed[0]}[/yellow]")
+                else:
+                    console.print(f"\n[yellow]Detected changes in {len(changed)} files[/yellow]")
 
                 # Run incremental analysis
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
                 try:
-                    summary = loop.run_until_complete(
-                        autodoc.analyze_directory(
-                            Path(path), incremental=True, exclude_patterns=list(exclude)
-                        )
-                    )
+                    summary = run_analysis(incremental=True)
                     _display_summary(summary)
                     if save:
-                        autodoc.save()
-                        console.print("[green]✅ Cache updated[/green]")
+                        # Don't hold up the next batch while the cache is serialized
+                        self._request_save()
                 except Exception as e:
                     console.print(f"[red]Error during analysis: {e}[/red]")
-                finally:
-                    loop.close()
 
                 console.print("\n[dim]Watching for changes... (Ctrl+C to stop)[/dim]")
 
+    # Batches are flushed from timer threads, so every analysis is submitted
+    # to one long-lived loop running in the background instead of a loop per change
+    if UVLOOP_AVAILABLE:
+        import uvloop
+
+        loop = uvloop.new_event_loop()
+    else:
+        loop = asyncio.new_event_loop()
+    loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+    loop_thread.start()
+
+    def run_analysis(incremental):
+        coro = autodoc.analyze_directory(
+            path, incremental=incremental, exclude_patterns=list(exclude)
+        )
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
     # Initial analysis
     console.print("[yellow]Running initial analysis...[/yellow]")
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        summary = loop.run_until_complete(
-            autodoc.analyze_directory(Path(path), incremental=False, exclude_patterns=list(exclude))
-        )
-        _display_summary(summary)
-        if save:
-            autodoc.save()
-    finally:
-        loop.close()
+    summary = run_analysis(incremental=False)
+    _display_summary(summary)
+    if save:
+        autodoc.save()
 
     # Set up file watcher
     event_handler = CodeChangeHandler()
     observer = Observer()
-    observer.schedule(event_handler, path, recursive=True)
+    observer.schedule(event_handler, str(path), recursive=True)
     observer.start()
 
     console.print("\n[green]Watch mode started. Monitoring for changes...[/green]")
@@ -416,6 +641,10 @@ def _run_watch_mode(autodoc, path, save, exclude):
         observer.stop()
         console.print("\n[yellow]Stopping watch mode...[/yellow]")
     observer.join()
+    event_handler.cancel()
+    loop.call_soon_threadsafe(loop.stop)
+    loop_thread.join()
+    loop.close()
     console.print("[green]Watch mode stopped.[/green]")
 
 
@@ -433,39 +662,47 @@ def search(query, limit, type, file, regex):
       autodoc search "analyze" --type function
       autodoc search "test" --file "*/tests/*"
     """
-    autodoc = SimpleAutodoc()
-    autodoc.load()
+    interactive = sys.stdout.isatty()
+    if interactive:
+        _prewarm("rich.table")
+    autodoc = _autodoc()
 
     if not autodoc.entities:
         console.print("[red]No analyzed code found. Run 'autodoc analyze' first.[/red]")
         return
 
-    # Run async function in event loop
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        results = loop.run_until_complete(
-            autodoc.search(query, limit, type_filter=type, file_filter=file, use_regex=regex)
-        )
-    finally:
-        loop.close()
+    results = _run_async(
+        autodoc.search(query, limit, type_filter=type, file_filter=file, use_regex=regex)
+    )
 
     if not results:
         console.print("[yellow]No results found[/yellow]")
         return
 
+    if not interactive:
+        # Piped output gets plain tab-separated rows, which are cheap to emit and easy to cut/grep
+        for result in results:
+            entity = result["entity"]
+            click.echo(
+                f"{entity['type']}\t{entity['name']}\t{entity['file_path']}\t{result['similarity']:.2f}"
+            )
+        return
+
+    from rich.table import Table
+
     table = Table(title=f"Search Results for '{query}'")
     table.add_column("Type", style="cyan")
     table.add_column("Name", style="magenta")
     table.add_column("File", style="green")
     table.add_column("Match", style="yellow")
 
+    add_row = table.add_row
     for result in results:
         entity = result["entity"]
-        table.add_row(
+        add_row(
             entity["type"],
             entity["name"],
-            Path(entity["file_path"]).name,
+            os.path.basename(entity["file_path"]),
             f"{result['similarity']:.2f}",
         )
 
@@ -473,7 +710,7 @@ def search(query, limit, type, file, regex):
 
 
 @cli.command()
-@click.argument("file_path", type=click.Path(exists=True))
+@click.argument("file_path", type=click.Path(exists=True, path_type=Path))
 @click.option("--limit", "-n", default=5, help="Number of similar items to show")
 @click.option("--type", "-t", "type_filter", help="Filter by entity type (file, function, class)")
 @click.option("--json", "output_json", is_flag=True, help="Output as JSON for programmatic use")
@@ -492,8 +729,8 @@ def similar(file_path, limit, type_filter, output_json):
     """
     from pathlib import Path as PathLib
 
-    config = AutodocConfig.load()
-    target_path = PathLib(file_path).resolve()
+    config = _config()
+    target_path = file_path.resolve()
 
     # Check if we have embeddings
     chromadb_dir = PathLib(config.embeddings.persist_directory)
@@ -549,12 +786,9 @@ def similar(file_path, limit, type_filter, output_json):
 
     # Search for similar entities
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        search_results = loop.run_until_complete(
+        search_results = _run_async(
             embedder.search(target_text, limit=limit + 10)  # Get extra to filter out self
         )
-        loop.close()
     except Exception as e:
         console.print(f"[red]Error searching embeddings: {e}[/red]")
         return
@@ -605,7 +839,9 @@ def similar(file_path, limit, type_filter, output_json):
         return
 
     # Rich console output
-    console.print(f"\n[bold]Files similar to [cyan]{PathLib(file_path).name}[/cyan]:[/bold]\n")
+    console.print(f"\n[bold]Files similar to [cyan]{file_path.name}[/cyan]:[/bold]\n")
+
+    from rich.table import Table
 
     table = Table(show_header=True)
     table.add_column("File", style="green")
@@ -626,7 +862,7 @@ def similar(file_path, limit, type_filter, output_json):
 
 
 @cli.command()
-@click.argument("file_path", type=click.Path(exists=True))
+@click.argument("file_path", type=click.Path(exists=True, path_type=Path))
 @click.option("--reverse", "-r", is_flag=True, help="Show what imports this file (reverse deps)")
 @click.option("--json", "output_json", is_flag=True, help="Output as JSON for programmatic use")
 def deps(file_path, reverse, output_json):
@@ -641,10 +877,9 @@ def deps(file_path, reverse, output_json):
       autodoc deps src/api/users.py --json          # JSON output
     """
     import ast
-    import re
     from pathlib import Path as PathLib
 
-    target_path = PathLib(file_path).resolve()
+    target_path = file_path.resolve()
     target_name = target_path.stem  # filename without extension
 
     if not target_path.exists():
@@ -751,10 +986,13 @@ def deps(file_path, reverse, output_json):
             return
 
         if not dependents:
-            console.print(f"[yellow]No files found that import {PathLib(file_path).name}[/yellow]")
+            console.print(f"[yellow]No files found that import {file_path.name}[/yellow]")
             return
 
-        console.print(f"\n[bold]Files that import [cyan]{PathLib(file_path).name}[/cyan]:[/bold]\n")
+        console.print(f"\n[bold]Files that import [cyan]{file_path.name}[/cyan]:[/bold]\n")
+
+        from rich.table import Table
+
         table = Table(show_header=True)
         table.add_column("File", style="green")
         table.add_column("Import Statement", style="dim")
@@ -780,10 +1018,10 @@ def deps(file_path, reverse, output_json):
             return
 
         if not imports:
-            console.print(f"[yellow]No imports found in {PathLib(file_path).name}[/yellow]")
+            console.print(f"[yellow]No imports found in {file_path.name}[/yellow]")
             return
 
-        console.print(f"\n[bold]Imports in [cyan]{PathLib(file_path).name}[/cyan]:[/bold]\n")
+        console.print(f"\n[bold]Imports in [cyan]{file_path.name}[/cyan]:[/bold]\n")
 
         # Group by module
         by_module = {}
@@ -794,6 +1032,8 @@ def deps(file_path, reverse, output_json):
             if imp.get("name"):
                 by_module[module].append(imp["name"])
 
+        from rich.table import Table
+
         table = Table(show_header=True)
         table.add_column("Module", style="green")
         table.add_column("Imports", style="cyan")
@@ -807,8 +1047,10 @@ def deps(file_path, reverse, output_json):
 
 
 @cli.command()
-@click.argument("cache1", type=click.Path(exists=True), default="autodoc_cache.json")
-@click.argument("cache2", type=click.Path(exists=True), required=False)
+@click.argument(
+    "cache1", type=click.Path(exists=True, path_type=Path), default="autodoc_cache.json"
+)
+@click.argument("cache2", type=click.Path(exists=True, path_type=Path), required=False)
 @click.option("--detailed", "-d", is_flag=True, help="Show detailed differences")
 def diff(cache1, cache2, detailed):
     """Compare two analysis caches to see what changed
@@ -818,14 +1060,11 @@ def diff(cache1, cache2, detailed):
       autodoc diff cache1.json cache2.json      # Compare two specific caches
       autodoc diff --detailed                   # Show detailed changes
     """
-    import json
-    from pathlib import Path
-
     # If no second cache specified, look for backup
     if not cache2:
         backup_path = Path(f"{cache1}.backup")
         if backup_path.exists():
-            cache2 = str(backup_path)
+            cache2 = backup_path
             console.print(f"[blue]Comparing {cache1} with backup {cache2}[/blue]")
         else:
             console.print("[red]No second cache file specified and no backup found.[/red]")
@@ -834,21 +1073,19 @@ def diff(cache1, cache2, detailed):
 
     # Load caches
     try:
-        with open(cache1, "r") as f:
-            data1 = json.load(f)
-        with open(cache2, "r") as f:
-            data2 = json.load(f)
+        data1 = _read_json(cache1)
+        data2 = _read_json(cache2)
     except Exception as e:
         console.print(f"[red]Error loading cache files: {e}[/red]")
         return
 
-    entities1 = {f"{e['file_path']}:{e['name']}": e for e in data1.get("entities", [])}
-    entities2 = {f"{e['file_path']}:{e['name']}": e for e in data2.get("entities", [])}
+    entities1 = {(e["file_path"], e["name"]): e for e in data1.get("entities", [])}
+    entities2 = {(e["file_path"], e["name"]): e for e in data2.get("entities", [])}
 
-    # Find differences
-    added = set(entities1.keys()) - set(entities2.keys())
-    removed = set(entities2.keys()) - set(entities1.keys())
-    common = set(entities1.keys()) & set(entities2.keys())
+    # Find differences (key views support set operations directly)
+    added = entities1.keys() - entities2.keys()
+    removed = entities2.keys() - entities1.keys()
+    common = entities1.keys() & entities2.keys()
 
     modified = []
     for key in common:
@@ -869,32 +1106,35 @@ def diff(cache1, cache2, detailed):
     console.print(f"  Modified: [yellow]{len(modified)}[/yellow] entities")
     console.print(f"  Unchanged: {len(common) - len(modified)} entities")
 
-    if detailed or (added or removed or modified):
+    # Added and removed entities are always listed; modified ones only with --detailed
+    shown_modified = modified if detailed else []
+
+    if added or removed or shown_modified:
+        # Resolve each displayed file's basename once, however many entities it holds
+        basenames = {
+            file_path: os.path.basename(file_path)
+            for file_path, _ in itertools.chain(added, removed, shown_modified)
+        }
+
         # Show details
         if added:
             console.print("\n[green]Added entities:[/green]")
             for key in sorted(added):
                 entity = entities1[key]
-                console.print(
-                    f"  + {entity['type']} {entity['name']} in {Path(entity['file_path']).name}"
-                )
+                console.print(f"  + {entity['type']} {entity['name']} in {basenames[key[0]]}")
 
         if removed:
             console.print("\n[red]Removed entities:[/red]")
             for key in sorted(removed):
                 entity = entities2[key]
-                console.print(
-                    f"  - {entity['type']} {entity['name']} in {Path(entity['file_path']).name}"
-                )
+                console.print(f"  - {entity['type']} {entity['name']} in {basenames[key[0]]}")
 
-        if modified and detailed:
+        if shown_modified:
             console.print("\n[yellow]Modified entities:[/yellow]")
-            for key in sorted(modified):
+            for key in sorted(shown_modified):
                 entity1 = entities1[key]
                 entity2 = entities2[key]
-                console.print(
-                    f"  ~ {entity1['type']} {entity1['name']} in {Path(entity1['file_path']).name}"
-                )
+                console.print(f"  ~ {entity1['type']} {entity1['name']} in {basenames[key[0]]}")
 
                 # Show what changed
                 if entity1.get("line_number") != entity2.get("line_number"):
@@ -908,7 +1148,7 @@ def diff(cache1, cache2, detailed):
 
 
 @cli.command()
-@click.argument("output", type=click.Path(), default="autodoc_export.zip")
+@click.argument("output", type=click.Path(path_type=Path), default="autodoc_export.zip")
 @click.option("--include-enrichments", is_flag=True, help="Include enrichment cache")
 @click.option("--include-config", is_flag=True, help="Include configuration")
 def export(output, include_enrichments, include_config):
@@ -920,12 +1160,11 @@ def export(output, include_enrichments, include_config):
     - autodoc_config.json (if --include-config)
     """
     import zipfile
-    from pathlib import Path
 
     files_to_export = []
 
     # Always include main cache
-    if Path("autodoc_cache.json").exists():
+    if _cache_exists():
         files_to_export.append("autodoc_cache.json")
     else:
         console.print("[red]No analysis cache found. Run 'autodoc analyze' first.[/red]")
@@ -941,13 +1180,14 @@ def export(output, include_enrichments, include_config):
 
     # Create zip file
     try:
-        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zf:
+        # Level 1 deflate is several times faster than the default on large caches
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
             for file in files_to_export:
                 zf.write(file)
                 console.print(f"[green]Added {file}[/green]")
 
         # Get file size
-        size = Path(output).stat().st_size / 1024  # KB
+        size = output.stat().st_size / 1024  # KB
         console.print(f"\n[green]✅ Exported to {output} ({size:.1f} KB)[/green]")
         console.print(f"[blue]Files included: {', '.join(files_to_export)}[/blue]")
 
@@ -956,7 +1196,7 @@ def export(output, include_enrichments, include_config):
 
 
 @cli.command()
-@click.argument("input_file", type=click.Path(exists=True))
+@click.argument("input_file", type=click.Path(exists=True, path_type=Path))
 @click.option("--overwrite", is_flag=True, help="Overwrite existing files")
 def import_(input_file, overwrite):
     """Import analysis data from export file
@@ -967,7 +1207,6 @@ def import_(input_file, overwrite):
     - autodoc_config.json (if present)
     """
     import zipfile
-    from pathlib import Path
 
     try:
         with zipfile.ZipFile(input_file, "r") as zf:
@@ -977,8 +1216,9 @@ def import_(input_file, overwrite):
             for file in files:
                 console.print(f"  • {file}")
 
-            # Check for existing files
-            existing = [f for f in files if Path(f).exists()]
+            # Check for existing files; top-level names are looked up in one directory listing
+            cwd_names = _cwd_names()
+            existing = [f for f in files if f in cwd_names or ("/" in f and Path(f).exists())]
             if existing and not overwrite:
                 console.print("\n[yellow]The following files already exist:[/yellow]")
                 for file in existing:
@@ -986,15 +1226,23 @@ def import_(input_file, overwrite):
                 console.print("[red]Use --overwrite to replace existing files.[/red]")
                 return
 
-            # Extract files
+            # Extract files, keeping the analysis cache in memory so it isn't re-read from disk
             console.print("\n[yellow]Importing files...[/yellow]")
+            cache_raw = None
             for file in files:
-                zf.extract(file)
+                if file == "autodoc_cache.json":
+                    cache_raw = zf.read(file)
+                    Path(file).write_bytes(cache_raw)
+                else:
+                    zf.extract(file)
                 console.print(f"[green]✅ Imported {file}[/green]")
 
             # Load and show summary
+            from .autodoc import SimpleAutodoc
+
             autodoc = SimpleAutodoc()
-            autodoc.load()
+            if cache_raw is not None:
+                autodoc.load_from_dict(_parse_json(cache_raw))
             console.print(
                 f"\n[green]Successfully imported {len(autodoc.entities)} entities[/green]"
             )
@@ -1022,11 +1270,7 @@ def test_map(output, format):
     Analyzes test files to find which functions are being tested,
     helping identify test coverage gaps.
     """
-    import json
-    from pathlib import Path
-
-    autodoc = SimpleAutodoc()
-    autodoc.load()
+    autodoc = _autodoc()
 
     if not autodoc.entities:
         console.print("[red]No analyzed code found. Run 'autodoc analyze' first.[/red]")
@@ -1036,10 +1280,18 @@ def test_map(output, format):
     test_mapping = {}
     tested_functions = set()
 
-    # Get all test functions
-    test_functions = [
-        e for e in autodoc.entities if e.file_path.find("test") != -1 and e.type == "function"
-    ]
+    # Split functions into tests and code under test, indexing the latter by name
+    test_functions = []
+    all_functions = []
+    functions_by_name = {}
+    for e in autodoc.entities:
+        if e.type != "function":
+            continue
+        if "test" in e.file_path:
+            test_functions.append(e)
+        else:
+            all_functions.append(e)
+            functions_by_name.setdefault(e.name, []).append(e)
 
     for test_func in test_functions:
         if not test_func.code:
@@ -1049,39 +1301,31 @@ def test_map(output, format):
         # This is a basic implementation - could be enhanced with AST analysis
         tested = []
 
-        # Look for direct function calls
-        import re
-
-        # Match function calls like func_name( or self.func_name(
-        call_pattern = r"(?:self\.)?\b(\w+)\s*\("
-        calls = re.findall(call_pattern, test_func.code)
+        # Look for direct function calls, visiting each called name once
+        calls = dict.fromkeys(m.group(1) for m in _CALL_RE.finditer(test_func.code))
 
         # Match against known functions
         for call in calls:
-            for entity in autodoc.entities:
-                if (
-                    entity.type == "function"
-                    and entity.name == call
-                    and entity.file_path.find("test") == -1
-                ):
-                    tested.append(
-                        {"name": entity.name, "file": entity.file_path, "line": entity.line_number}
-                    )
-                    tested_functions.add(f"{entity.file_path}:{entity.name}")
+            for entity in functions_by_name.get(call, ()):
+                tested.append(
+                    {"name": entity.name, "file": entity.file_path, "line": entity.line_number}
+                )
+                tested_functions.add((entity.file_path, entity.name))
 
         if tested:
             test_mapping[f"{test_func.file_path}::{test_func.name}"] = tested
 
     # Find untested functions
-    all_functions = [
-        e for e in autodoc.entities if e.type == "function" and e.file_path.find("test") == -1
-    ]
     untested = []
     for func in all_functions:
-        func_id = f"{func.file_path}:{func.name}"
-        if func_id not in tested_functions and not func.name.startswith("_"):
+        if (func.file_path, func.name) not in tested_functions and not func.name.startswith("_"):
             untested.append({"name": func.name, "file": func.file_path, "line": func.line_number})
 
+    # Basenames for the rendered file columns, resolved once per file
+    basenames = {
+        file_path: os.path.basename(file_path) for file_path in {f.file_path for f in all_functions}
+    }
+
     # Format output
     if format == "json":
         result = {
@@ -1096,7 +1340,7 @@ def test_map(output, format):
                 ),
             },
         }
-        output_text = json.dumps(result, indent=2)
+        output_text = _dump_json(result)
 
     elif format == "markdown":
         lines = ["# Test Coverage Mapping\n"]
@@ -1113,17 +1357,17 @@ def test_map(output, format):
         for test, functions in test_mapping.items():
             lines.append(f"### {test}")
             for func in functions:
-                lines.append(f"- `{func['name']}` in {Path(func['file']).name}:{func['line']}")
+                lines.append(f"- `{func['name']}` in {basenames[func['file']]}:{func['line']}")
             lines.append("")
 
         if untested:
             lines.append("## Untested Functions\n")
             for func in untested[:20]:  # Show first 20
-                lines.append(f"- `{func['name']}` in {Path(func['file']).name}:{func['line']}")
+                lines.append(f"- `{func['name']}` in {basenames[func['file']]}:{func['line']}")
             if len(untested) > 20:
                 lines.append(f"\n... and {len(untested) - 20} more")
 
-        output_text = "\n".join(lines)
+        output_text = "\n".join(lines).encode("utf-8")
 
     else:  # table format
         # Summary
@@ -1138,11 +1382,11 @@ def test_map(output, format):
         if test_mapping:
             console.print("\n[bold]Sample Test Mappings:[/bold]")
             shown = 0
-            for test, functions in list(test_mapping.items())[:5]:
+            for test, functions in itertools.islice(test_mapping.items(), 5):
                 test_name = test.split("::")[1]
                 console.print(f"\n[cyan]{test_name}[/cyan] tests:")
                 for func in functions[:3]:
-                    console.print(f"  → {func['name']} ({Path(func['file']).name})")
+                    console.print(f"  → {func['name']} ({basenames[func['file']]})")
                 if len(functions) > 3:
                     console.print(f"  ... and {len(functions) - 3} more")
                 shown += 1
@@ -1150,13 +1394,16 @@ def test_map(output, format):
         # Show untested functions
         if untested:
             console.print(f"\n[bold]Untested Functions ({len(untested)} total):[/bold]")
+
+            from rich.table import Table
+
             table = Table()
             table.add_column("Function", style="red")
             table.add_column("File", style="dim")
             table.add_column("Line", style="dim")
 
             for func in untested[:10]:
-                table.add_row(func["name"], Path(func["file"]).name, str(func["line"]))
+                table.add_row(func["name"], basenames[func["file"]], str(func["line"]))
             console.print(table)
             if len(untested) > 10:
                 console.print(f"[dim]... and {len(untested) - 10} more[/dim]")
@@ -1165,7 +1412,7 @@ def test_map(output, format):
 
     # Write to file if specified
     if output and output_text:
-        with open(output, "w") as f:
+        with open(output, "wb") as f:
             f.write(output_text)
         console.print(f"\n[green]Output written to {output}[/green]")
 
@@ -1173,13 +1420,13 @@ def test_map(output, format):
 @cli.command()
 def check():
     """Check dependencies and configuration"""
-    console.print("[bold]Autodoc Status:[/bold]\n")
+    click.secho("Autodoc Status:\n", bold=True)
 
     # Load config to check embedding provider
-    config = AutodocConfig.load()
+    config = _config()
     embedding_provider = config.embeddings.provider
 
-    console.print(f"[blue]Embedding Provider: {embedding_provider}[/blue]")
+    click.secho(f"Embedding Provider: {embedding_provider}", fg="blue")
 
     if embedding_provider == "chromadb":
         # Check ChromaDB
@@ -1188,35 +1435,38 @@ def check():
 
             embedder = ChromaDBEmbedder(persist_directory=config.embeddings.persist_directory)
             stats = embedder.get_stats()
-            console.print("✅ ChromaDB configured")
-            console.print(f"   Model: {config.embeddings.chromadb_model}")
-            console.print(f"   Embeddings: {stats['total_embeddings']}")
-            console.print(f"   Directory: {stats['persist_directory']}")
+            click.echo("✅ ChromaDB configured")
+            click.echo(f"   Model: {config.embeddings.chromadb_model}")
+            click.echo(f"   Embeddings: {stats['total_embeddings']}")
+            click.echo(f"   Directory: {stats['persist_directory']}")
         except Exception as e:
-            console.print(f"❌ ChromaDB error: {e}")
+            click.echo(f"❌ ChromaDB error: {e}")
     else:
         # Check OpenAI
         api_key = os.getenv("OPENAI_API_KEY")
         if api_key and api_key != "sk-...":
-            console.print("✅ OpenAI API key configured")
+            click.echo("✅ OpenAI API key configured")
         else:
-            console.print("❌ OpenAI API key not found")
-            console.print("   Set OPENAI_API_KEY in .env file")
+            click.echo("❌ OpenAI API key not found")
+            click.echo("   Set OPENAI_API_KEY in .env file")
+
+    # List the working directory once instead of stat-ing each file
+    cwd_names = _cwd_names()
 
-    if Path("autodoc_cache.json").exists():
-        console.print("✅ Analyzed code cache found")
+    if "autodoc_cache.json" in cwd_names:
+        click.echo("✅ Analyzed code cache found")
     else:
-        console.print("ℹ️  No analyzed code found - run 'autodoc analyze' first")
+        click.echo("ℹ️  No analyzed code found - run 'autodoc analyze' first")
 
     # Check for enrichment cache
-    if Path("autodoc_enrichment_cache.json").exists():
-        console.print("✅ Enrichment cache found")
+    if "autodoc_enrichment_cache.json" in cwd_names:
+        click.echo("✅ Enrichment cache found")
 
     # Check for config file
-    if Path(".autodoc.yml").exists() or Path("autodoc.yml").exists():
-        console.print("✅ Configuration file found")
+    if ".autodoc.yml" in cwd_names or "autodoc.yml" in cwd_names:
+        click.echo("✅ Configuration file found")
     else:
-        console.print("ℹ️  No config file - using defaults (run 'autodoc init' to create)")
+        click.echo("ℹ️  No config file - using defaults (run 'autodoc init' to create)")
 
 
 @cli.command(name="init")
@@ -1229,6 +1479,8 @@ def init_config():
         if not click.confirm("Overwrite existing configuration?"):
             return
 
+    from .config import AutodocConfig
+
     # Create default config
     config = AutodocConfig()
     config.save(config_path)
@@ -1274,10 +1526,16 @@ def init_config():
 @click.option("--module-files", is_flag=True, help="Generate module-level enrichment files")
 @click.option(
     "--module-format",
-    type=click.Choice(["markdown", "json"]),
+    type=_FORMAT_CHOICES,
     default="markdown",
     help="Format for module enrichment files",
 )
+@click.option(
+    "--batch",
+    "batch_api",
+    is_flag=True,
+    help="Submit a discounted provider batch job (OpenAI/Anthropic); may take hours",
+)
 @click.option("--dry-run", is_flag=True, help="Preview changes without modifying files")
 def enrich(
     limit,
@@ -1292,11 +1550,12 @@ def enrich(
     backup,
     module_files,
     module_format,
+    batch_api,
     dry_run,
 ):
     """Enrich code entities with LLM-generated descriptions"""
     # Run async function
-    asyncio.run(
+    _run_async(
         _enrich_async(
             limit,
             filter,
@@ -1311,6 +1570,7 @@ def enrich(
             module_files,
             module_format,
             dry_run,
+            batch_api=batch_api,
         )
     )
 
@@ -1329,8 +1589,20 @@ async def _enrich_async(
     module_files,
     module_format,
     dry_run,
+    batch_api=False,
 ):
     """Async implementation of enrich command"""
+    import asyncio
+
+    from .autodoc import SimpleAutodoc
+    from .config import AutodocConfig
+    from .enrichment import EnrichmentCache, LLMEnricher, match_cached_duplicates
+    from .inline_enrichment import (
+        InlineEnricher,
+        ModuleEnrichmentGenerator,
+        group_entities_by_file,
+    )
+
     # Load config
     config = AutodocConfig.load()
 
@@ -1341,55 +1613,57 @@ async def _enrich_async(
         config.llm.model = model
 
     # Check API key (but allow inline/module operations with cached data)
+    # Provider settings are fixed from here on, so resolve them once
+    llm_provider = config.llm.provider
     api_key = config.llm.get_api_key()
-    if not api_key and config.llm.provider != "ollama":
+    missing_api_key = not api_key and llm_provider != "ollama"
+    if missing_api_key:
         if not (inline or module_files):
-            console.print(f"[red]No API key found for {config.llm.provider}[/red]")
+            console.print(f"[red]No API key found for {llm_provider}[/red]")
             console.print("[yellow]Set via environment variable or .autodoc.yml[/yellow]")
             console.print(
-                f"[yellow]Example: export {config.llm.provider.upper()}_API_KEY=your-api-key[/yellow]"
+                f"[yellow]Example: export {llm_provider.upper()}_API_KEY=your-api-key[/yellow]"
             )
             return
         else:
             console.print(
-                f"[yellow]No API key found for {config.llm.provider} - will use cached enrichments only[/yellow]"
+                f"[yellow]No API key found for {llm_provider} - will use cached enrichments only[/yellow]"
             )
             console.print("[dim]To generate new enrichments, set your API key[/dim]")
 
-    # Load entities
+    # Load entities off the event loop; the cache parse can take a while
     autodoc = SimpleAutodoc()
-    autodoc.load()
+    await asyncio.to_thread(autodoc.load)
 
     if not autodoc.entities:
         console.print("[red]No analyzed code found. Run 'autodoc analyze' first.[/red]")
         return
 
-    # Filter entities
-    entities = autodoc.entities
+    # Filter entities in one lazy pass, stopping as soon as the limit is reached
+    entities = iter(autodoc.entities)
     if type != "all":
-        entities = [e for e in entities if e.type == type]
+        entities = (e for e in entities if e.type == type)
     if filter:
-        import re
-
-        pattern = re.compile(filter, re.IGNORECASE)
-        entities = [e for e in entities if pattern.search(e.name)]
-    if limit:
-        entities = entities[:limit]
+        if re.escape(filter) == filter:
+            # No regex metacharacters, so a case-insensitive substring test is enough
+            needle = filter.lower()
+            entities = (e for e in entities if needle in e.name.lower())
+        else:
+            search = re.compile(filter, re.IGNORECASE).search
+            entities = (e for e in entities if search(e.name))
+    entities = list(itertools.islice(entities, limit or None))
 
     console.print(
-        f"[yellow]Enriching {len(entities)} entities with {config.llm.provider}/{config.llm.model}...[/yellow]"
+        f"[yellow]Enriching {len(entities)} entities with {llm_provider}/{config.llm.model}...[/yellow]"
     )
 
-    # Load cache
-    cache = EnrichmentCache()
+    # Load cache; a dry run must not journal new enrichments to disk either
+    cache = await asyncio.to_thread(EnrichmentCache, journal=not dry_run)
 
     # Filter out already cached entities unless force is set
     if not force:
-        uncached = []
-        for entity in entities:
-            cache_key = f"{entity.file_path}:{entity.name}:{entity.line_number}"
-            if not cache.get_enrichment(cache_key):
-                uncached.append(entity)
+        cached_keys = cache.key_set()
+        uncached = [e for e in entities if e.cache_key not in cached_keys]
 
         if len(uncached) < len(entities):
             console.print(
@@ -1397,53 +1671,91 @@ async def _enrich_async(
             )
         entities = uncached
 
+        # Entities whose code matches an already enriched one reuse its enrichment
+        if entities and config.enrichment.reuse_duplicates:
+            reused = match_cached_duplicates(entities, autodoc.entities, cache)
+            if reused:
+                cache.set_enrichments(reused)
+                entities = [e for e in entities if e.cache_key not in reused]
+                console.print(
+                    f"[blue]Reused cached enrichments for {len(reused)} duplicate entities[/blue]"
+                )
+
     # Initialize counters
     enriched_count = 0
     failed_count = 0
 
     if not entities:
         console.print("[green]All entities are already enriched![/green]")
-    elif not api_key and config.llm.provider != "ollama":
+    elif missing_api_key:
         console.print("[yellow]Skipping enrichment - no API key available[/yellow]")
     else:
-        # Enrich entities
-        async with LLMEnricher(config) as enricher:
-            with console.status("[yellow]Enriching entities...[/yellow]") as status:
-                # Process in smaller batches for better progress feedback
-                batch_size = min(config.enrichment.batch_size, 5)
+        # Enrich entities, keeping up to max_concurrency batches in flight since each
+        # batch is mostly waiting on LLM round trips
+        enrichment_config = config.enrichment
+        batch_size = enrichment_config.batch_size
+        batches = [entities[i : i + batch_size] for i in range(0, len(entities), batch_size)]
+        semaphore = asyncio.Semaphore(enrichment_config.max_concurrency)
 
-                for i in range(0, len(entities), batch_size):
-                    batch = entities[i : i + batch_size]
-                    batch_names = [e.name for e in batch]
-                    status.update(f"[yellow]Enriching: {', '.join(batch_names)}...[/yellow]")
+        async with LLMEnricher(config) as enricher:
+            if batch_api and not enricher.supports_batch:
+                console.print(
+                    f"[yellow]No batch API for {llm_provider} - enriching live instead[/yellow]"
+                )
 
+            async def run_batch(batch):
+                async with semaphore:
                     try:
-                        enriched_batch = await enricher.enrich_entities(batch)
-
-                        # Cache results
-                        for enriched in enriched_batch:
-                            cache_key = f"{enriched.entity.file_path}:{enriched.entity.name}:{enriched.entity.line_number}"
-                            cache.set_enrichment(
-                                cache_key,
-                                {
-                                    "description": enriched.description,
-                                    "purpose": enriched.purpose,
-                                    "key_features": enriched.key_features,
-                                    "complexity_notes": enriched.complexity_notes,
-                                    "usage_examples": enriched.usage_examples,
-                                    "design_patterns": enriched.design_patterns,
-                                    "dependencies": enriched.dependencies,
-                                },
-                            )
-                            enriched_count += 1
-
+                        if batch_api:
+                            return batch, await enricher.enrich_entities_batch(batch)
+                        return batch, await enricher.enrich_entities(batch)
                     except Exception as e:
-                        console.print(f"[red]Error enriching batch: {e}[/red]")
+                        return batch, e
+
+            if batch_api and enricher.supports_batch:
+                # One provider-side job for everything; it is polled until it finishes
+                batches = [entities]
+                status_message = f"[yellow]Waiting for {llm_provider} batch job...[/yellow]"
+            else:
+                status_message = "[yellow]Enriching entities...[/yellow]"
+
+            with console.status(status_message) as status:
+                done = 0
+                for next_batch in asyncio.as_completed([run_batch(b) for b in batches]):
+                    batch, enriched_batch = await next_batch
+                    done += len(batch)
+                    batch_names = ", ".join(e.name for e in batch)
+                    status.update(
+                        f"[yellow]Enriched {done}/{len(entities)}: {batch_names}...[/yellow]"
+                    )
+
+                    if isinstance(enriched_batch, Exception):
+                        console.print(f"[red]Error enriching batch: {enriched_batch}[/red]")
                         failed_count += len(batch)
+                        continue
+
+                    # Record the batch as it lands; the cache journals it straight to
+                    # disk so an interrupted run keeps what it has enriched
+                    cache.set_enrichments(
+                        {
+                            enriched.entity.cache_key: {
+                                "description": enriched.description,
+                                "purpose": enriched.purpose,
+                                "key_features": enriched.key_features,
+                                "complexity_notes": enriched.complexity_notes,
+                                "usage_examples": enriched.usage_examples,
+                                "design_patterns": enriched.design_patterns,
+                                "dependencies": enriched.dependencies,
+                            }
+                            for enriched in enriched_batch
+                        }
+                    )
+                    enriched_count += len(enriched_batch)
 
-    # Save cache
+    # Save cache, skipping the rewrite when nothing new was enriched
     if not dry_run:
-        cache.save_cache()
+        if cache.dirty:
+            await asyncio.to_thread(cache.save_cache)
     else:
         console.print("\n[blue]DRY RUN: Enrichment cache was not saved[/blue]")
 
@@ -1454,6 +1766,10 @@ async def _enrich_async(
 
     console.print("\n[blue]Enrichment cached in autodoc_enrichment_cache.json[/blue]")
 
+    # Both file-level passes walk entities per file, so group them once
+    if inline or module_files:
+        entities_by_file = group_entities_by_file(autodoc.entities)
+
     # Handle inline enrichment
     if inline:
         if dry_run:
@@ -1465,11 +1781,16 @@ async def _enrich_async(
 
         inline_enricher = InlineEnricher(config, backup=backup, dry_run=dry_run)
         inline_results = await inline_enricher.enrich_files_inline(
-            autodoc.entities, incremental=incremental, force=force
+            autodoc.entities,
+            incremental=incremental,
+            force=force,
+            entities_by_file=entities_by_file,
         )
 
-        total_updated = sum(r.updated_docstrings for r in inline_results)
-        total_errors = sum(len(r.errors) for r in inline_results)
+        total_updated = total_errors = 0
+        for result in inline_results:
+            total_updated += result.updated_docstrings
+            total_errors += len(result.errors)
 
         if dry_run:
             console.print(
@@ -1505,7 +1826,7 @@ async def _enrich_async(
 
         module_generator = ModuleEnrichmentGenerator(config, dry_run=dry_run)
         generated_files = await module_generator.generate_module_enrichment_files(
-            autodoc.entities, output_format=module_format
+            autodoc.entities, output_format=module_format, entities_by_file=entities_by_file
         )
 
         if dry_run:
@@ -1517,8 +1838,8 @@ async def _enrich_async(
                 f"[green]✅ Generated {len(generated_files)} module enrichment files[/green]"
             )
 
-        for file_path in generated_files[:5]:  # Show first 5
-            console.print(f"  📄 {Path(file_path).name}")
+        for file_path in itertools.islice(generated_files, 5):  # Show first 5
+            console.print(f"  📄 {os.path.basename(file_path)}")
         if len(generated_files) > 5:
             console.print(f"  ... and {len(generated_files) - 5} more")
 
@@ -1559,24 +1880,18 @@ async def _enrich_async(
             # Use OpenAI embeddings
             console.print("[blue]Regenerating OpenAI embeddings...[/blue]")
 
-            texts = []
-            for entity in autodoc_regen.entities:
-                text = f"{entity.type} {entity.name}"
-
-                # Use enriched description
-                cache_key = f"{entity.file_path}:{entity.name}:{entity.line_number}"
-                enrichment = cache.get_enrichment(cache_key)
-                if enrichment and enrichment.get("description"):
-                    text += f": {enrichment['description']}"
-                    if enrichment.get("key_features"):
-                        text += " Features: " + ", ".join(enrichment["key_features"])
-                elif entity.docstring:
-                    text += f": {entity.docstring}"
+            # Reuse the enrichment cache already in memory rather than reloading it
+            texts = autodoc_regen.build_embedding_texts(autodoc_regen.entities, cache)
 
-                texts.append(text)
-
-            # Generate embeddings
-            embeddings = await autodoc_regen.embedder.embed_batch(texts)
+            # Generate embeddings, with several batches in flight at once
+            embeddings_config = config.embeddings
+            text_embeddings = await _embed_texts_concurrently(
+                autodoc_regen.embedder,
+                list(dict.fromkeys(texts)),
+                embeddings_config.batch_size,
+                embeddings_config.max_concurrency,
+            )
+            embeddings = [text_embeddings[text] for text in texts]
             for entity, embedding in zip(autodoc_regen.entities, embeddings):
                 entity.embedding = embedding
 
@@ -1599,12 +1914,10 @@ async def _enrich_async(
 @click.option("--visualize", is_flag=True, help="Create visualizations after building graph")
 def graph(clear, visualize):
     """Build code relationship graph database"""
-    if not GRAPH_AVAILABLE:
+    if not _load_graph():
         console.print("[red]Graph functionality not available.[/red]")
 
         # Check if dependencies are installed
-        import importlib.util
-
         deps = {
             "matplotlib": "visualization",
             "plotly": "interactive graphs",
@@ -1640,6 +1953,8 @@ def graph(clear, visualize):
             console.print("  autodoc local-graph")
         return
 
+    from .autodoc import SimpleAutodoc
+
     autodoc = SimpleAutodoc()
     autodoc.load()
 
@@ -1697,8 +2012,10 @@ def graph(clear, visualize):
 @click.option("--regenerate", is_flag=True, help="Regenerate all embeddings (overwrite existing)")
 def vector(regenerate):
     """Generate embeddings for semantic search"""
+    from .autodoc import SimpleAutodoc
+
     # Load config to determine embedding provider
-    config = AutodocConfig.load()
+    config = _config()
     autodoc = SimpleAutodoc(config)
 
     # Load existing entities
@@ -1730,9 +2047,7 @@ def vector(regenerate):
             autodoc.chromadb_embedder.clear_collection()
 
         # Run embedding generation asynchronously
-        import asyncio
-
-        embedded_count = asyncio.run(
+        embedded_count = _run_async(
             autodoc.chromadb_embedder.embed_entities(
                 autodoc.entities,
                 use_enrichment=True,
@@ -1758,7 +2073,7 @@ def vector(regenerate):
     try:
         console.print("[yellow]Generating embeddings for semantic search...[/yellow]")
 
-        # Prepare texts for embedding
+        # Prepare texts for embedding; identical texts are embedded only once
         texts = []
         entities_to_embed = []
 
@@ -1774,12 +2089,23 @@ def vector(regenerate):
             console.print("[green]✅ All entities already have embeddings![/green]")
             return
 
-        console.print(f"Generating embeddings for {len(texts)} entities...")
-
-        # Generate embeddings in batches
-        import asyncio
+        unique_texts = list(dict.fromkeys(texts))
+        console.print(
+            f"Generating embeddings for {len(texts)} entities "
+            f"({len(unique_texts)} unique texts)..."
+        )
 
-        embeddings = asyncio.run(autodoc.embedder.embed_batch(texts))
+        # Generate embeddings in concurrent batches
+        embeddings_config = autodoc.config.embeddings
+        text_embeddings = _run_async(
+            _embed_texts_concurrently(
+                autodoc.embedder,
+                unique_texts,
+                embeddings_config.batch_size,
+                embeddings_config.max_concurrency,
+            )
+        )
+        embeddings = [text_embeddings[text] for text in texts]
 
         # Assign embeddings to entities
         for entity, embedding in zip(entities_to_embed, embeddings):
@@ -1801,6 +2127,28 @@ def vector(regenerate):
         )
 
 
+async def _embed_texts_concurrently(embedder, texts, batch_size, max_concurrency):
+    """Embed texts in batches, at most max_concurrency batches in flight.
+
+    Returns a mapping from each text to its embedding.
+    """
+    import asyncio
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+
+    async def embed_batch(batch):
+        async with semaphore:
+            return await embedder.embed_batch(batch)
+
+    results = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+    return {
+        text: embedding
+        for batch, embeddings in zip(batches, results)
+        for text, embedding in zip(batch, embeddings)
+    }
+
+
 @cli.command(name="visualize-graph")
 @click.option("--output", "-o", default=None, help="Output file for interactive graph (default: .autodoc/visualizations/)")
 @click.option("--deps", is_flag=True, help="Create module dependency graph")
@@ -1811,7 +2159,7 @@ def visualize_graph(output, deps, complexity, create_all):
 
     Output files are written to .autodoc/visualizations/ by default.
     """
-    if not GRAPH_AVAILABLE:
+    if not _load_graph():
         console.print("[red]Graph functionality not available. Install graph dependencies:[/red]")
         console.print("pip install matplotlib plotly neo4j networkx pyvis")
         return
@@ -1821,25 +2169,38 @@ def visualize_graph(output, deps, complexity, create_all):
         query = CodeGraphQuery()
         visualizer = CodeGraphVisualizer(query)
 
+        # (render function, args) for the plotly outputs; each opens its own Neo4j
+        # session, so they can run in parallel
+        tasks = []
         created_files = []
-
         if create_all or not (deps or complexity):
             # Default: create interactive graph
             out_file = output or ".autodoc/visualizations/code_graph.html"
-            visualizer.create_interactive_graph(output)
+            tasks.append((visualizer.create_interactive_graph, (output,)))
             created_files.append(out_file)
 
-        if create_all or deps:
-            deps_file = ".autodoc/visualizations/module_dependencies.png"
-            visualizer.create_module_dependency_graph()
-            created_files.append(deps_file)
+        # The dependency graph is drawn with pyplot, which is not safe to use off the
+        # main thread with GUI backends, so it renders here while the others run
+        render_deps = create_all or deps
+        if render_deps:
+            created_files.append(".autodoc/visualizations/module_dependencies.png")
 
         if create_all or complexity:
             complexity_file = ".autodoc/visualizations/complexity_heatmap.html"
-            visualizer.create_complexity_heatmap()
+            tasks.append((visualizer.create_complexity_heatmap, ()))
             created_files.append(complexity_file)
 
-        query.close()
+        from concurrent.futures import ThreadPoolExecutor
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(len(tasks), 1)) as executor:
+                futures = [executor.submit(render, *args) for render, args in tasks]
+                if render_deps:
+                    visualizer.create_module_dependency_graph()
+            for future in futures:
+                future.result()
+        finally:
+            query.close()
 
         console.print("[green]✅ Graph visualizations created:[/green]")
         for file in created_files:
@@ -1859,94 +2220,121 @@ def visualize_graph(output, deps, complexity, create_all):
 @click.option("--all", "show_all", is_flag=True, help="Show all analysis")
 def query_graph(entry_points, test_coverage, patterns, complexity, deps, show_all):
     """Query the code graph for insights"""
-    if not GRAPH_AVAILABLE:
+    if not _load_graph():
         console.print("[red]Graph functionality not available. Install graph dependencies:[/red]")
         console.print("pip install matplotlib plotly neo4j networkx pyvis")
         return
 
+    from neo4j.exceptions import DriverError, Neo4jError
+
     try:
         query = CodeGraphQuery()
 
+        # Each section is an independent Neo4j round-trip, so run them in parallel
+        lookups = {}
         if show_all or entry_points:
-            console.print("\n[bold]Entry Points:[/bold]")
-            entry_points_data = query.find_entry_points()
+            lookups["entry_points"] = (query.find_entry_points, ())
+        if show_all or test_coverage:
+            lookups["test_coverage"] = (query.find_test_coverage, ())
+        if show_all or patterns:
+            lookups["patterns"] = (query.find_code_patterns, ())
+        if show_all or complexity:
+            lookups["complexity"] = (query.get_module_complexity, ())
+        if deps:
+            lookups["deps"] = (query.find_dependencies, (deps,))
+
+        results = {}
+        if lookups:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=len(lookups)) as executor:
+                futures = {
+                    name: executor.submit(lookup, *args) for name, (lookup, args) in lookups.items()
+                }
+            results = {name: future.result() for name, future in futures.items()}
+
+        # Each section is collected into one block and printed with a single call
+        if "entry_points" in results:
+            lines = ["\n[bold]Entry Points:[/bold]"]
+            entry_points_data = results["entry_points"]
             if entry_points_data:
                 for ep in entry_points_data:
-                    console.print(f"  • {ep['name']} in {Path(ep['file']).name}")
+                    lines.append(f"  • {ep['name']} in {os.path.basename(ep['file'])}")
                     if ep.get("description"):
-                        console.print(f"    {ep['description']}")
+                        lines.append(f"    {ep['description']}")
             else:
-                console.print("  None found")
+                lines.append("  None found")
+            console.print("\n".join(lines))
 
-        if show_all or test_coverage:
-            console.print("\n[bold]Test Coverage:[/bold]")
-            coverage = query.find_test_coverage()
+        if "test_coverage" in results:
+            lines = ["\n[bold]Test Coverage:[/bold]"]
+            coverage = results["test_coverage"]
             if coverage:
                 total_functions = coverage.get("total_functions", 0)
                 total_tests = coverage.get("total_tests", 0)
                 tested_modules = coverage.get("tested_modules", [])
 
-                console.print(f"  • Total functions: {total_functions}")
-                console.print(f"  • Total tests: {total_tests}")
+                lines.append(f"  • Total functions: {total_functions}")
+                lines.append(f"  • Total tests: {total_tests}")
                 if total_functions > 0:
                     ratio = (total_tests / total_functions) * 100
-                    console.print(f"  • Test ratio: {ratio:.1f}%")
-                console.print(f"  • Tested modules: {len(tested_modules)}")
-                for module in tested_modules[:5]:
-                    console.print(f"    - {module}")
+                    lines.append(f"  • Test ratio: {ratio:.1f}%")
+                lines.append(f"  • Tested modules: {len(tested_modules)}")
+                lines.extend(f"    - {module}" for module in tested_modules[:5])
             else:
-                console.print("  No coverage data available")
+                lines.append("  No coverage data available")
+            console.print("\n".join(lines))
 
-        if show_all or patterns:
-            console.print("\n[bold]Code Patterns:[/bold]")
-            patterns_data = query.find_code_patterns()
+        if "patterns" in results:
+            lines = ["\n[bold]Code Patterns:[/bold]"]
+            patterns_data = results["patterns"]
             if patterns_data:
                 for pattern_type, instances in patterns_data.items():
                     if instances:
-                        console.print(
+                        lines.append(
                             f"  • {pattern_type.replace('_', ' ').title()}: {len(instances)}"
                         )
-                        for instance in instances[:3]:
-                            console.print(f"    - {instance['name']}")
+                        lines.extend(f"    - {instance['name']}" for instance in instances[:3])
             else:
-                console.print("  No patterns found")
+                lines.append("  No patterns found")
+            console.print("\n".join(lines))
 
-        if show_all or complexity:
-            console.print("\n[bold]Module Complexity:[/bold]")
-            complexity_data = query.get_module_complexity()
+        if "complexity" in results:
+            lines = ["\n[bold]Module Complexity:[/bold]"]
+            complexity_data = results["complexity"]
             if complexity_data:
-                console.print("  Top 5 most complex modules:")
+                lines.append("  Top 5 most complex modules:")
                 for module in complexity_data[:5]:
-                    console.print(f"    • {module['module']}: {module['complexity_score']:.1f}")
-                    console.print(
+                    lines.append(f"    • {module['module']}: {module['complexity_score']:.1f}")
+                    lines.append(
                         f"      Functions: {module['function_count']}, Classes: {module['class_count']}"
                     )
             else:
-                console.print("  No complexity data available")
+                lines.append("  No complexity data available")
+            console.print("\n".join(lines))
 
-        if deps:
-            console.print(f"\n[bold]Dependencies for '{deps}':[/bold]")
-            deps_data = query.find_dependencies(deps)
+        if "deps" in results:
+            lines = [f"\n[bold]Dependencies for '{deps}':[/bold]"]
+            deps_data = results["deps"]
 
             depends_on = deps_data.get("depends_on", [])
             depended_by = deps_data.get("depended_by", [])
 
             if depends_on:
-                console.print("  Depends on:")
-                for dep in depends_on:
-                    console.print(f"    • {dep['name']} ({dep['type']})")
+                lines.append("  Depends on:")
+                lines.extend(f"    • {dep['name']} ({dep['type']})" for dep in depends_on)
 
             if depended_by:
-                console.print("  Depended on by:")
-                for dep in depended_by:
-                    console.print(f"    • {dep['name']} ({dep['type']})")
+                lines.append("  Depended on by:")
+                lines.extend(f"    • {dep['name']} ({dep['type']})" for dep in depended_by)
 
             if not depends_on and not depended_by:
-                console.print("  No dependencies found")
+                lines.append("  No dependencies found")
+            console.print("\n".join(lines))
 
         query.close()
 
-    except Exception as e:
+    except (DriverError, Neo4jError, OSError) as e:
         console.print(f"[red]Error querying graph: {e}[/red]")
         console.print("[yellow]Make sure you've run 'autodoc graph' first[/yellow]")
 
@@ -1957,7 +2345,7 @@ def query_graph(entry_points, test_coverage, patterns, complexity, deps, show_al
     "--format",
     "output_format",
     default="markdown",
-    type=click.Choice(["markdown", "json"]),
+    type=_FORMAT_CHOICES,
     help="Output format (default: markdown)",
 )
 @click.option(
@@ -1977,13 +2365,15 @@ def generate(output, output_format, detailed, enrich, inline):
     """Generate comprehensive codebase documentation"""
     # Run async function for enrichment if needed
     if enrich:
-        asyncio.run(_generate_with_enrichment_async(output, output_format, detailed, inline))
+        _run_async(_generate_with_enrichment_async(output, output_format, detailed, inline))
     else:
         _generate_documentation_only(output, output_format, detailed)
 
 
 def _generate_documentation_only(output, output_format, detailed):
     """Generate documentation without enrichment."""
+    from .autodoc import SimpleAutodoc
+
     autodoc = SimpleAutodoc()
     autodoc.load()
 
@@ -2000,102 +2390,172 @@ def _generate_documentation_only(output, output_format, detailed):
 
     # Handle output format and ensure proper file extension
     if output_format == "json":
-        output_content = json.dumps(summary, indent=2, default=str)
+        if ORJSON_AVAILABLE:
+            chunks = (orjson.dumps(summary, option=orjson.OPT_INDENT_2, default=str),)
+        else:
+            encoder = json.JSONEncoder(indent=2, default=str)
+            chunks = (chunk.encode("utf-8") for chunk in encoder.iterencode(summary))
         if not output.endswith(".json"):
             output = output.replace(".md", ".json") if output.endswith(".md") else output + ".json"
     else:  # markdown
-        output_content = autodoc.format_summary_markdown(summary)
+        chunks = (chunk.encode("utf-8") for chunk in autodoc.iter_summary_markdown(summary))
         if not output.endswith(".md"):
             output = output.replace(".json", ".md") if output.endswith(".json") else output + ".md"
 
-    # Always save to file
+    # Always save to file, streaming encoded chunks instead of building the whole document
     try:
-        with open(output, "w", encoding="utf-8") as f:
-            f.write(output_content)
+        size = 0
+        with open(output, "wb", buffering=1 << 20) as f:
+            for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
         console.print(f"[green]✅ Documentation generated: {output}[/green]")
-        console.print(f"[blue]File size: {len(output_content):,} characters[/blue]")
+        console.print(f"[blue]File size: {size:,} bytes[/blue]")
 
         # Show preview of what was generated
         overview = summary["overview"]
-        console.print("\n[bold]📊 Documentation Summary:[/bold]")
-        console.print(
-            f"  • {overview['total_functions']} functions across {overview['total_files']} files"
-        )
-        console.print(f"  • {overview['total_classes']} classes analyzed")
-        console.print(f"  • {len(summary.get('feature_map', {}))} feature categories identified")
-        console.print(f"  • {len(summary.get('modules', {}))} modules documented")
+        build_system = summary.get("build_system") or {}
+        test_system = summary.get("test_system") or {}
+        ci_configuration = summary.get("ci_configuration") or {}
+
+        lines = [
+            "\n[bold]📊 Documentation Summary:[/bold]",
+            f"  • {overview['total_functions']} functions across {overview['total_files']} files",
+            f"  • {overview['total_classes']} classes analyzed",
+            f"  • {len(summary.get('feature_map', {}))} feature categories identified",
+            f"  • {len(summary.get('modules', {}))} modules documented",
+        ]
 
         # Show build and CI info
-        if summary.get("build_system") and summary["build_system"].get("build_tools"):
-            console.print(f"  • Build tools: {', '.join(summary['build_system']['build_tools'])}")
+        build_tools = build_system.get("build_tools")
+        if build_tools:
+            lines.append(f"  • Build tools: {', '.join(build_tools)}")
 
-        if summary.get("test_system"):
-            test_count = summary["test_system"].get("test_functions_count", 0)
-            console.print(f"  • {test_count} test functions found")
+        if test_system:
+            test_count = test_system.get("test_functions_count", 0)
+            lines.append(f"  • {test_count} test functions found")
 
-        if summary.get("ci_configuration") and summary["ci_configuration"].get("has_ci"):
-            platforms = summary["ci_configuration"].get("platforms", [])
-            console.print(f"  • CI/CD platforms: {', '.join(platforms)}")
+        if ci_configuration.get("has_ci"):
+            platforms = ci_configuration.get("platforms", [])
+            lines.append(f"  • CI/CD platforms: {', '.join(platforms)}")
 
-    except Exception as e:
+        console.print("\n".join(lines))
+
+    except OSError as e:
         console.print(f"[red]Error saving file: {e}[/red]")
 
 
 async def _generate_with_enrichment_async(output, output_format, detailed, inline):
     """Generate documentation with automatic enrichment."""
-    config = AutodocConfig.load()
-    autodoc = SimpleAutodoc(config)
-    autodoc.load()
+    import asyncio
 
-    if not autodoc.entities:
-        console.print("[red]No analyzed code found. Run 'autodoc analyze' first.[/red]")
-        return
+    from .autodoc import SimpleAutodoc
+    from .enrichment import EnrichmentCache, LLMEnricher, match_cached_duplicates
+    from .inline_enrichment import InlineEnricher, group_entities_by_file
 
-    # Check API key
+    config = _config()
+
+    # Check API key before paying for the analysis cache load
     api_key = config.llm.get_api_key()
     if not api_key and config.llm.provider != "ollama":
         console.print(f"[red]No API key found for {config.llm.provider}[/red]")
         console.print("[yellow]Set via environment variable or .autodoc.yml[/yellow]")
         return
 
+    autodoc = SimpleAutodoc(config)
+    await asyncio.to_thread(autodoc.load)
+
+    if not autodoc.entities:
+        console.print("[red]No analyzed code found. Run 'autodoc analyze' first.[/red]")
+        return
+
     console.print("[yellow]Enriching entities before generating documentation...[/yellow]")
 
     # Load cache
-    cache = EnrichmentCache()
+    cache = await asyncio.to_thread(EnrichmentCache)
+
+    # Find entities that need enrichment with one snapshot of the cached keys
+    cached_keys = cache.key_set()
+    entities_to_enrich = [e for e in autodoc.entities if e.cache_key not in cached_keys]
+
+    # Entities whose code matches an already enriched one reuse its enrichment
+    if entities_to_enrich and config.enrichment.reuse_duplicates:
+        reused = match_cached_duplicates(entities_to_enrich, autodoc.entities, cache)
+        if reused:
+            cache.set_enrichments(reused)
+            entities_to_enrich = [e for e in entities_to_enrich if e.cache_key not in reused]
+            console.print(
+                f"[blue]Reused cached enrichments for {len(reused)} duplicate entities[/blue]"
+            )
 
-    # Find entities that need enrichment
-    entities_to_enrich = []
-    for entity in autodoc.entities:
-        cache_key = f"{entity.file_path}:{entity.name}:{entity.line_number}"
-        if not cache.get_enrichment(cache_key):
-            entities_to_enrich.append(entity)
+    # With --inline, each changed file is rewritten as soon as its last entity is
+    # enriched, so docstring rewriting overlaps with the remaining LLM requests
+    rewrite_tasks = []
+    pending_by_file = {}
+    if inline:
+        console.print("[yellow]Adding enriched docstrings inline to code files...[/yellow]")
+        inline_enricher = InlineEnricher(config)
+        entities_by_file = group_entities_by_file(autodoc.entities)
+        changed_files = inline_enricher.change_detector.get_changed_files(
+            autodoc.entities, entities_by_file
+        )
+        pending_by_file = {
+            file_path: 0
+            for file_path in changed_files
+            if file_path.endswith(".py") and Path(file_path).exists()
+        }
+        for entity in entities_to_enrich:
+            if entity.file_path in pending_by_file:
+                pending_by_file[entity.file_path] += 1
+
+    def start_rewrite(file_path):
+        del pending_by_file[file_path]
+        file_entities = entities_by_file[file_path]
+        enrichments = {
+            entity.cache_key: enrichment
+            for entity in file_entities
+            if (enrichment := cache.get_enrichment(entity.cache_key))
+        }
+        rewrite_tasks.append(
+            asyncio.create_task(
+                inline_enricher.rewrite_file(Path(file_path), file_entities, enrichments)
+            )
+        )
+
+    for file_path, pending in list(pending_by_file.items()):
+        if not pending:
+            start_rewrite(file_path)
 
     if entities_to_enrich:
         console.print(f"[blue]Enriching {len(entities_to_enrich)} entities...[/blue]")
 
-        # Enrich entities
+        # Enrich entities, caching each result as it arrives
+        enriched_count = 0
         async with LLMEnricher(config) as enricher:
             try:
-                enriched = await enricher.enrich_entities(entities_to_enrich)
-
-                # Cache results
-                for enriched_entity in enriched:
-                    cache_key = f"{enriched_entity.entity.file_path}:{enriched_entity.entity.name}:{enriched_entity.entity.line_number}"
-                    cache.set_enrichment(
-                        cache_key,
-                        {
-                            "description": enriched_entity.description,
-                            "purpose": enriched_entity.purpose,
-                            "key_features": enriched_entity.key_features,
-                            "complexity_notes": enriched_entity.complexity_notes,
-                            "usage_examples": enriched_entity.usage_examples,
-                            "design_patterns": enriched_entity.design_patterns,
-                            "dependencies": enriched_entity.dependencies,
-                        },
-                    )
+                async for entity, enriched_entity in enricher.enrich_entities_as_completed(
+                    entities_to_enrich
+                ):
+                    if enriched_entity:
+                        enriched_count += 1
+                        cache.set_enrichment(
+                            entity.cache_key,
+                            {
+                                "description": enriched_entity.description,
+                                "purpose": enriched_entity.purpose,
+                                "key_features": enriched_entity.key_features,
+                                "complexity_notes": enriched_entity.complexity_notes,
+                                "usage_examples": enriched_entity.usage_examples,
+                                "design_patterns": enriched_entity.design_patterns,
+                                "dependencies": enriched_entity.dependencies,
+                            },
+                        )
+                    if entity.file_path in pending_by_file:
+                        pending_by_file[entity.file_path] -= 1
+                        if not pending_by_file[entity.file_path]:
+                            start_rewrite(entity.file_path)
 
-                cache.save_cache()
-                console.print(f"[green]✅ Enriched {len(enriched)} entities[/green]")
+                console.print(f"[green]✅ Enriched {enriched_count} entities[/green]")
 
             except Exception as e:
                 console.print(f"[red]Error during enrichment: {e}[/red]")
@@ -2103,17 +2563,20 @@ async def _generate_with_enrichment_async(output, output_format, detailed, inlin
     else:
         console.print("[green]All entities already enriched[/green]")
 
-    # Handle inline enrichment if requested
-    if inline:
-        console.print("[yellow]Adding enriched docstrings inline to code files...[/yellow]")
+    # Files still waiting after a failed enrichment run go ahead with what is cached
+    for file_path in list(pending_by_file):
+        start_rewrite(file_path)
 
-        inline_enricher = InlineEnricher(config)
-        inline_results = await inline_enricher.enrich_files_inline(
-            autodoc.entities, incremental=True, force=False
-        )
+    if cache.dirty:
+        await asyncio.to_thread(cache.save_cache)
 
-        total_updated = sum(r.updated_docstrings for r in inline_results)
-        console.print(f"[green]✅ Updated {total_updated} docstrings inline[/green]")
+    if inline:
+        if rewrite_tasks:
+            inline_results = await asyncio.gather(*rewrite_tasks)
+            total_updated = sum(r.updated_docstrings for r in inline_results)
+            console.print(f"[green]✅ Updated {total_updated} docstrings inline[/green]")
+        else:
+            console.print("[green]No files have changed since last enrichment[/green]")
 
     # Generate documentation
     _generate_documentation_only(output, output_format, detailed)
@@ -2122,19 +2585,19 @@ async def _generate_with_enrichment_async(output, output_format, detailed, inlin
 # Backwards compatibility alias
 @cli.command(name="generate-summary", hidden=True)
 @click.option("--output", "-o", help="Output file path")
-@click.option(
-    "--format", "output_format", default="markdown", type=click.Choice(["markdown", "json"])
-)
+@click.option("--format", "output_format", default="markdown", type=_FORMAT_CHOICES)
 def generate_summary_alias(output, output_format):
     """[DEPRECATED] Use 'autodoc generate' instead"""
     console.print(
         "[yellow]⚠️  'generate-summary' is deprecated. Use 'autodoc generate' instead.[/yellow]"
     )
-    from click import Context
-
-    ctx = Context(generate)
-    return ctx.invoke(
-        generate, output=output or "AUTODOC.md", output_format=output_format, detailed=False
+    # Call the command function directly; no Click context or parameter resolution needed
+    return generate.callback(
+        output=output or "AUTODOC.md",
+        output_format=output_format,
+        detailed=False,
+        enrich=False,
+        inline=False,
     )
 
 
@@ -2148,7 +2611,9 @@ def local_graph(files, entities, stats, create_all):
 
     Output files are written to .autodoc/visualizations/ by default.
     """
-    if not LOCAL_GRAPH_AVAILABLE:
+    try:
+        from .local_graph import LocalCodeGraph
+    except ImportError:
         console.print("[red]Local graph functionality not available.[/red]")
         console.print("This should not happen - please check the installation.")
         return
@@ -2160,8 +2625,6 @@ def local_graph(files, entities, stats, create_all):
     try:
         console.print("[yellow]Creating local code graphs...[/yellow]")
 
-        from .local_graph import LocalCodeGraph
-
         graph = LocalCodeGraph()
 
         if not graph.entities:
@@ -2170,21 +2633,26 @@ def local_graph(files, entities, stats, create_all):
 
         created_files = []
 
+        # The graph builders are independent, so render them in parallel threads
+        builders = []
         if create_all or files:
-            try:
-                file1 = graph.create_file_dependency_graph()
-                if file1:
-                    created_files.append(file1)
-            except Exception as e:
-                console.print(f"[yellow]Could not create file graph: {e}[/yellow]")
-
+            builders.append(("file", graph.create_file_dependency_graph))
         if create_all or entities:
-            try:
-                file2 = graph.create_entity_network()
-                if file2:
-                    created_files.append(file2)
-            except Exception as e:
-                console.print(f"[yellow]Could not create entity graph: {e}[/yellow]")
+            builders.append(("entity", graph.create_entity_network))
+
+        if builders:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=len(builders)) as executor:
+                futures = [(kind, executor.submit(build)) for kind, build in builders]
+
+            for kind, future in futures:
+                try:
+                    created = future.result()
+                    if created:
+                        created_files.append(created)
+                except Exception as e:
+                    console.print(f"[yellow]Could not create {kind} graph: {e}[/yellow]")
 
         if create_all or stats:
             console.print("")
@@ -2198,6 +2666,7 @@ def local_graph(files, entities, stats, create_all):
                 "\n[blue]💡 Open these HTML files in your browser to view interactive graphs![/blue]"
             )
 
+        # Only a hint, so check installed dependencies without importing graph.py
         if not GRAPH_AVAILABLE:
             console.print(
                 "\n[yellow]💡 For advanced graph features with Neo4j, install graph dependencies:[/yellow]"
@@ -2289,7 +2758,7 @@ def pack():
 @click.option("--json", "as_json", is_flag=True, help="Output as JSON")
 def pack_list(tag, security, as_json):
     """List all configured context packs."""
-    config = AutodocConfig.load()
+    config = _config()
 
     packs = config.context_packs
     if not packs:
@@ -2319,6 +2788,8 @@ def pack_list(tag, security, as_json):
         console.print(json.dumps(output, indent=2))
         return
 
+    from rich.table import Table
+
     # Rich table output
     table = Table(title="Context Packs")
     table.add_column("Name", style="cyan")
@@ -2356,7 +2827,7 @@ def pack_list(tag, security, as_json):
 @click.option("--deps", is_flag=True, help="Show resolved dependencies")
 def pack_info(name, as_json, deps):
     """Show detailed information about a context pack."""
-    config = AutodocConfig.load()
+    config = _config()
     pack_config = config.get_pack(name)
 
     if not pack_config:
@@ -2432,11 +2903,10 @@ def pack_build(name, build_all, output, embeddings, summary, dry_run, no_cache):
 
     Use --dry-run to preview what would be processed and estimated costs.
     """
-    import asyncio
     import fnmatch
     from pathlib import Path as PathLib
 
-    config = AutodocConfig.load()
+    config = _config()
 
     if build_all:
         packs_to_build = config.context_packs
@@ -2614,7 +3084,7 @@ def pack_build(name, build_all, output, embeddings, summary, dry_run, no_cache):
             chromadb_embedder.clear_collection()
 
             console.print(f"  [dim]Creating embeddings for {len(code_entities)} entities...[/dim]")
-            embedded_count = asyncio.get_event_loop().run_until_complete(
+            embedded_count = _run_async(
                 chromadb_embedder.embed_entities(code_entities, use_enrichment=True)
             )
             console.print(
@@ -2656,9 +3126,7 @@ def pack_build(name, build_all, output, embeddings, summary, dry_run, no_cache):
                             # Return both the summary and token usage
                             return result, enricher.get_token_usage()
 
-                    llm_summary, token_usage = asyncio.get_event_loop().run_until_complete(
-                        generate_summary()
-                    )
+                    llm_summary, token_usage = _run_async(generate_summary())
                     if llm_summary:
                         console.print("  [green]✓ Generated LLM summary[/green]")
                         # Display token usage
@@ -2695,8 +3163,7 @@ def pack_build(name, build_all, output, embeddings, summary, dry_run, no_cache):
         }
 
         pack_file = output_dir / f"{pack_config.name}.json"
-        with open(pack_file, "w") as f:
-            json.dump(pack_data, f, indent=2)
+        pack_file.write_bytes(_dump_json(pack_data))
 
         console.print(f"  [green]✓ Saved to {pack_file}[/green]")
 
@@ -2719,10 +3186,9 @@ def pack_query(name, query, limit, keyword, output_json):
 
     Use --json for programmatic output: {query, pack, search_type, results: [...]}
     """
-    import asyncio
     from pathlib import Path as PathLib
 
-    config = AutodocConfig.load()
+    config = _config()
     pack_config = config.get_pack(name)
 
     if not pack_config:
@@ -2763,9 +3229,7 @@ def pack_query(name, query, limit, keyword, output_json):
                 )
 
                 console.print("[dim]Using semantic search...[/dim]")
-                search_results = asyncio.get_event_loop().run_until_complete(
-                    embedder.search(query, limit=limit)
-                )
+                search_results = _run_async(embedder.search(query, limit=limit))
 
                 for r in search_results:
                     entity_data = {
@@ -3103,6 +3567,8 @@ def pack_auto_generate(save, output_json, min_files, min_entities, root_path, di
     """
     from pathlib import Path as PathLib
 
+    from .config import AutodocConfig, ContextPackConfig
+
     config = AutodocConfig.load()
     base_path = PathLib(root_path) if root_path else PathLib.cwd()
     suggested_packs = []
@@ -3460,7 +3926,7 @@ def impact_analysis(files, output_json, pack):
     import fnmatch
     from pathlib import Path as PathLib
 
-    config = AutodocConfig.load()
+    config = _config()
 
     if not config.context_packs:
         if output_json:
@@ -3613,7 +4079,7 @@ def pack_status(output_json):
     """
     from pathlib import Path as PathLib
 
-    config = AutodocConfig.load()
+    config = _config()
 
     if not config.context_packs:
         if output_json:
@@ -3695,7 +4161,7 @@ def pack_diff(name, output_json):
     """
     from pathlib import Path as PathLib
 
-    config = AutodocConfig.load()
+    config = _config()
     pack_config = config.get_pack(name)
 
     if not pack_config:
@@ -3827,7 +4293,7 @@ def pack_deps(name, output_json, transitive):
     Displays which other packs this pack depends on,
     and which packs depend on this one.
     """
-    config = AutodocConfig.load()
+    config = _config()
     pack_config = config.get_pack(name)
 
     if not pack_config:
@@ -3940,7 +4406,7 @@ def pack_export_skill(
             console.print("[red]Error: Either provide a pack name or use --all[/red]")
         return
 
-    config = AutodocConfig.load()
+    config = _config()
 
     if not config.context_packs:
         if output_json:
@@ -4037,24 +4503,15 @@ Provide:
 3. usage_patterns: How to use this code (2-3 common patterns)
 4. security_notes: Any security considerations (if applicable)"""
 
-                import asyncio
+                summary_text = _run_async(enricher.generate_llm_response(summary_prompt))
 
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    summary_text = loop.run_until_complete(
-                        enricher.generate_llm_response(summary_prompt)
-                    )
-
-                    # Parse structured response
-                    pack_data["llm_summary"] = {
-                        "architecture": summary_text,
-                        "key_components": [],
-                        "usage_patterns": [],
-                        "security_notes": [],
-                    }
-                finally:
-                    loop.close()
+                # Parse structured response
+                pack_data["llm_summary"] = {
+                    "architecture": summary_text,
+                    "key_components": [],
+                    "usage_patterns": [],
+                    "security_notes": [],
+                }
 
             except Exception as e:
                 if not output_json:
@@ -4158,7 +4615,7 @@ def features_detect(force, max_degree, as_json):
     """
     from .features import FeatureDetector, FeaturesCache
 
-    if not GRAPH_AVAILABLE:
+    if not _load_graph():
         console.print("[red]Graph functionality not available. Install dependencies:[/red]")
         console.print("  pip install neo4j matplotlib plotly networkx pyvis")
         return
@@ -4249,6 +4706,8 @@ def _display_detection_summary(result):
     console.print(f"  Max degree threshold: {result.max_degree_threshold}")
     console.print()
 
+    from rich.table import Table
+
     table = Table(title="Detected Features")
     table.add_column("ID", style="cyan")
     table.add_column("Name", style="green")
@@ -4285,8 +4744,6 @@ def features_name(feature_id, force, dry_run):
     Names are generated based on file paths and summaries in each cluster.
     Uses the configured LLM provider (anthropic, openai, ollama).
     """
-    import asyncio
-
     from .features import FeatureNamer, FeaturesCache
 
     cache = FeaturesCache()
@@ -4301,7 +4758,7 @@ def features_name(feature_id, force, dry_run):
         console.print("[yellow]No features to name.[/yellow]")
         return
 
-    config = AutodocConfig.load()
+    config = _config()
 
     # Check API key
     api_key = config.llm.get_api_key()
@@ -4360,7 +4817,7 @@ def features_name(feature_id, force, dry_run):
             except Exception as e:
                 console.print(f"  [red]Feature {fid}: {e}[/red]")
 
-    asyncio.run(name_features())
+    _run_async(name_features())
     console.print("\n[green]Feature naming complete![/green]")
 
 
@@ -4462,7 +4919,7 @@ def features_export(min_files, save, as_json):
     """
     from pathlib import Path as PathLib
 
-    from .config import ContextPackConfig
+    from .config import AutodocConfig, ContextPackConfig
     from .features import FeaturesCache
 
     cache = FeaturesCache()
@@ -4771,7 +5228,6 @@ def upgrade(check_only, yes, pre):
         autodoc upgrade -y        # Upgrade without confirmation
     """
     import subprocess
-    import sys
 
     from .__about__ import __version__ as current_version
 
@@ -4781,11 +5237,10 @@ def upgrade(check_only, yes, pre):
     console.print("[dim]Checking PyPI for latest version...[/dim]")
     try:
         import urllib.request
-        import json as json_module
 
         url = "https://pypi.org/pypi/ai-code-autodoc/json"
         with urllib.request.urlopen(url, timeout=10) as response:
-            data = json_module.loads(response.read().decode())
+            data = json.loads(response.read().decode())
 
         # Get all versions and filter based on --pre flag
         all_versions = list(data["releases"].keys())
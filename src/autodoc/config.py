@@ -47,7 +47,14 @@ class EnrichmentConfig(BaseModel):
 
     enabled: bool = Field(True, description="Enable or disable code enrichment")
     batch_size: int = Field(10, gt=0, le=100, description="Number of entities to process at once")
+    max_concurrency: int = Field(
+        4, gt=0, le=64, description="Enrichment batches requested concurrently"
+    )
     cache_enrichments: bool = Field(True, description="Cache enriched entities to disk")
+    reuse_duplicates: bool = Field(
+        True,
+        description="Reuse one enrichment for entities whose code differs only by name/whitespace",
+    )
     include_examples: bool = Field(True, description="Include usage examples in enrichment")
     analyze_complexity: bool = Field(True, description="Analyze code complexity during enrichment")
     detect_patterns: bool = Field(True, description="Detect design patterns during enrichment")
@@ -88,9 +95,15 @@ class EmbeddingsConfig(BaseModel):
     )
     dimensions: int = Field(1536, gt=0, description="Embedding dimensions")
     batch_size: int = Field(100, gt=0, le=1000, description="Batch size for embedding generation")
+    max_concurrency: int = Field(
+        8, gt=0, le=64, description="Embedding batches requested concurrently"
+    )
     persist_directory: str = Field(
         ".autodoc_chromadb", description="Directory for ChromaDB persistence"
     )
+    cache_quantization: Literal["none", "int8"] = Field(
+        "none", description="Precision used when storing embeddings in autodoc_cache.json"
+    )
 
 
 class GraphConfig(BaseModel):
@@ -2,9 +2,10 @@
 OpenAI embedding functionality for semantic search.
 """
 
-from typing import List
+from typing import List, Tuple
 
 import aiohttp
+import numpy as np
 
 
 class OpenAIEmbedder:
@@ -22,7 +23,7 @@ class OpenAIEmbedder:
                 "https://api.openai.com/v1/embeddings", headers=self.headers, json=data
             ) as response:
                 result = await response.json()
-                return result["data"][0]["embedding"]
+                return normalize_embedding(result["data"][0]["embedding"])
 
     async def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for multiple texts."""
@@ -31,3 +32,26 @@ class OpenAIEmbedder:
             embedding = await self.embed(text)
             embeddings.append(embedding)
         return embeddings
+
+
+def normalize_embedding(embedding: List[float]) -> List[float]:
+    """Scale an embedding to unit L2 norm so a dot product equals cosine similarity."""
+    vec = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vec))
+    if norm == 0.0:
+        return vec.tolist()
+    return (vec / norm).tolist()
+
+
+def quantize_embedding(embedding: List[float]) -> Tuple[List[int], float]:
+    """Quantize an embedding to symmetric int8 values plus a per-vector scale."""
+    vec = np.asarray(embedding, dtype=np.float32)
+    max_abs = float(np.abs(vec).max()) if vec.size else 0.0
+    scale = max_abs / 127.0 if max_abs > 0 else 1.0
+    quantized = np.clip(np.round(vec / scale), -127, 127).astype(np.int8)
+    return quantized.tolist(), scale
+
+
+def dequantize_embedding(quantized: List[int], scale: float) -> List[float]:
+    """Restore an approximate float embedding from its int8 representation."""
+    return (np.asarray(quantized, dtype=np.float32) * np.float32(scale)).tolist()
@@ -3,10 +3,29 @@
 LLM-powered code enrichment for autodoc.
 """
 
+import ast
+import asyncio
+import hashlib
 import json
 import logging
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+import os
+import re
+import sys
+import textwrap
+import threading
+from dataclasses import dataclass, replace
+from functools import cached_property, lru_cache
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+)
 
 import aiohttp
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
@@ -16,6 +35,20 @@ log = logging.getLogger(__name__)
 from .analyzer import CodeEntity
 from .config import AutodocConfig
 
+# Optional fast JSON codec for the enrichment cache
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+OPENAI_API_URL = "https://api.openai.com/v1"
+ANTHROPIC_API_URL = "https://api.anthropic.com/v1"
+
+# Providers whose asynchronous batch endpoints enrich_entities_batch can use
+BATCH_PROVIDERS = frozenset({"openai", "anthropic"})
+
 
 @dataclass
 class EnrichedEntity:
@@ -31,6 +64,120 @@ class EnrichedEntity:
     dependencies: Optional[List[str]] = None
 
 
+# EnrichedEntity fields whose text may mention the entity by name
+_DESCRIPTIVE_FIELDS = (
+    "description",
+    "purpose",
+    "key_features",
+    "complexity_notes",
+    "usage_examples",
+)
+
+
+@lru_cache(maxsize=256)
+def _definition_sources(file_path: str, mtime_ns: int) -> Dict[Tuple[str, int], str]:
+    """Source of each function/class in a file, keyed by (name, line number).
+
+    ``mtime_ns`` is only part of the cache key, so edited files are re-read.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        source = f.read()
+    return {
+        (node.name, node.lineno): ast.get_source_segment(source, node) or ""
+        for node in ast.walk(ast.parse(source))
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+    }
+
+
+def entity_source(entity: CodeEntity) -> Optional[str]:
+    """Complete source of an entity's definition, or None if it is unavailable.
+
+    The analyzers store only signature stubs such as ``def name(...)`` in
+    ``CodeEntity.code``, so the definition is read back from ``file_path``.
+    ``code`` itself is used when it already holds complete, parseable source.
+    """
+    if entity.file_path.endswith(".py"):
+        try:
+            mtime_ns = os.stat(entity.file_path).st_mtime_ns
+            source = _definition_sources(entity.file_path, mtime_ns).get(
+                (entity.name, entity.line_number)
+            )
+            if source:
+                return source
+        except (OSError, SyntaxError, ValueError):
+            pass
+
+    try:
+        ast.parse(textwrap.dedent(entity.code or ""))
+    except (SyntaxError, ValueError):
+        return None
+    return entity.code or None
+
+
+def code_fingerprint(entity: CodeEntity) -> Optional[str]:
+    """Digest of an entity's source, ignoring whitespace and the entity's own name.
+
+    Boilerplate that differs only in naming (copied helpers, identical
+    ``__init__`` bodies) shares a fingerprint, so one enrichment can serve
+    every copy. Returns None when the entity's source is unavailable.
+    """
+    source = entity_source(entity)
+    if source is None:
+        return None
+    code = re.sub(rf"\b{re.escape(entity.name)}\b", "\0", source)
+    normalized = " ".join(code.split())
+    if not normalized:
+        return None
+    digest = hashlib.blake2b(f"{entity.type}\0{normalized}".encode(), digest_size=16)
+    return digest.hexdigest()
+
+
+def _rename(value: Any, pattern: "re.Pattern[str]", name: str) -> Any:
+    if isinstance(value, str):
+        return pattern.sub(name, value)
+    if isinstance(value, list):
+        return [_rename(item, pattern, name) for item in value]
+    return value
+
+
+def adapt_enrichment(
+    enrichment: Dict[str, Any], source_name: str, target_name: str
+) -> Dict[str, Any]:
+    """Copy an enrichment written for source_name so that it describes target_name."""
+    if source_name == target_name:
+        return dict(enrichment)
+    pattern = re.compile(rf"\b{re.escape(source_name)}\b")
+    return {key: _rename(value, pattern, target_name) for key, value in enrichment.items()}
+
+
+def match_cached_duplicates(
+    entities: List[CodeEntity], candidates: List[CodeEntity], cache: "EnrichmentCache"
+) -> Dict[str, Dict[str, Any]]:
+    """Find cached enrichments that can be reused for near-duplicate entities.
+
+    Returns enrichments keyed by cache key for each entity in ``entities`` whose
+    code fingerprint matches an already-enriched entity in ``candidates``.
+    """
+    cached_keys = cache.key_set()
+    by_fingerprint: Dict[str, CodeEntity] = {}
+    for candidate in candidates:
+        if candidate.cache_key in cached_keys:
+            fingerprint = code_fingerprint(candidate)
+            if fingerprint is not None:
+                by_fingerprint.setdefault(fingerprint, candidate)
+
+    reused = {}
+    if not by_fingerprint:
+        return reused
+    for entity in entities:
+        source = by_fingerprint.get(code_fingerprint(entity))
+        if source is not None:
+            reused[entity.cache_key] = adapt_enrichment(
+                cache.get_enrichment(source.cache_key), source.name, entity.name
+            )
+    return reused
+
+
 class LLMEnricher:
     """Enriches code entities with LLM-generated descriptions and analysis."""
 
@@ -39,13 +186,22 @@ class LLMEnricher:
         self.llm_config = config.llm
         self.enrichment_config = config.enrichment
         self._session: Optional[aiohttp.ClientSession] = None
+        # Bounds in-flight LLM requests across every caller sharing this enricher
+        self._request_semaphore = asyncio.Semaphore(self.enrichment_config.max_concurrency)
         # Token tracking for cost control
         self.total_input_tokens = 0
         self.total_output_tokens = 0
         self.api_calls = 0
 
     async def __aenter__(self):
-        self._session = aiohttp.ClientSession()
+        # One pooled session for every request, sized to the concurrent batches so
+        # kept-alive connections are reused instead of re-handshaking per call
+        connector = aiohttp.TCPConnector(
+            limit_per_host=self.enrichment_config.max_concurrency,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+        )
+        self._session = aiohttp.ClientSession(connector=connector)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -83,30 +239,105 @@ class LLMEnricher:
             )
             return []
 
-        enriched = []
+        return await self._enrich_unique(
+            entities, lambda unique: self._enrich_batch(unique, context)
+        )
 
-        # Process in batches
-        batch_size = self.enrichment_config.batch_size
-        for i in range(0, len(entities), batch_size):
-            batch = entities[i : i + batch_size]
-            batch_enriched = await self._enrich_batch(batch, context)
-            enriched.extend(batch_enriched)
+    async def _enrich_unique(
+        self,
+        entities: List[CodeEntity],
+        enrich: Callable[[List[CodeEntity]], Awaitable[List[EnrichedEntity]]],
+    ) -> List[EnrichedEntity]:
+        """Enrich one entity per code fingerprint and share the result with its duplicates."""
+        unique, duplicates = self._split_duplicates(entities)
+
+        enriched = await enrich(unique)
+        if not duplicates:
+            return enriched
+
+        shared = [
+            self._share_enrichment(item, duplicate)
+            for item in enriched
+            for duplicate in duplicates.get(id(item.entity), ())
+        ]
+        if shared:
+            log.debug(f"Reused enrichments for {len(shared)} duplicate entities")
+        return enriched + shared
+
+    def _split_duplicates(
+        self, entities: List[CodeEntity]
+    ) -> Tuple[List[CodeEntity], Dict[int, List[CodeEntity]]]:
+        """Split entities into one per code fingerprint and, keyed by id(), its duplicates."""
+        if not self.enrichment_config.reuse_duplicates:
+            return list(entities), {}
+
+        unique = []
+        duplicates: Dict[int, List[CodeEntity]] = {}
+        first_by_fingerprint: Dict[str, CodeEntity] = {}
+        for entity in entities:
+            fingerprint = code_fingerprint(entity)
+            first = first_by_fingerprint.setdefault(fingerprint, entity) if fingerprint else entity
+            if first is entity:
+                unique.append(entity)
+            else:
+                duplicates.setdefault(id(first), []).append(entity)
+        return unique, duplicates
+
+    @staticmethod
+    def _share_enrichment(item: EnrichedEntity, duplicate: CodeEntity) -> EnrichedEntity:
+        """Copy an enrichment onto a duplicate entity, renaming mentions of the original."""
+        text = {field: getattr(item, field) for field in _DESCRIPTIVE_FIELDS}
+        renamed = adapt_enrichment(text, item.entity.name, duplicate.name)
+        return replace(item, entity=duplicate, **renamed)
+
+    async def enrich_entities_as_completed(
+        self, entities: List[CodeEntity], context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Tuple[CodeEntity, Optional[EnrichedEntity]]]:
+        """Yield ``(entity, enriched)`` for each entity as soon as its request finishes.
 
-        return enriched
+        Every input entity is yielded exactly once; ``enriched`` is None when it
+        could not be enriched, so callers can track per-entity completion.
+        """
+        if not self.enrichment_config.enabled or not self.llm_config.get_api_key():
+            for entity in entities:
+                yield entity, None
+            return
+
+        unique, duplicates = self._split_duplicates(entities)
+
+        async def enrich_one(entity: CodeEntity) -> Tuple[CodeEntity, Optional[EnrichedEntity]]:
+            async with self._request_semaphore:
+                try:
+                    return entity, await self._enrich_single(entity, context)
+                except Exception as e:
+                    log.error(f"Error enriching {entity.name}: {e}")
+                    return entity, None
+
+        for next_done in asyncio.as_completed([enrich_one(entity) for entity in unique]):
+            entity, enriched = await next_done
+            yield entity, enriched
+            for duplicate in duplicates.get(id(entity), ()):
+                yield duplicate, self._share_enrichment(enriched, duplicate) if enriched else None
 
     async def _enrich_batch(
         self, entities: List[CodeEntity], context: Optional[Dict[str, Any]] = None
     ) -> List[EnrichedEntity]:
-        """Enrich a batch of entities."""
-        enriched = []
+        """Enrich a batch of entities, with up to max_concurrency requests in flight."""
 
-        for entity in entities:
-            try:
-                enriched_entity = await self._enrich_single(entity, context)
-                if enriched_entity:
-                    enriched.append(enriched_entity)
-            except Exception as e:
-                log.error(f"Error enriching {entity.name}: {e}")
+        async def enrich_one(entity: CodeEntity) -> Optional[EnrichedEntity]:
+            async with self._request_semaphore:
+                return await self._enrich_single(entity, context)
+
+        results = await asyncio.gather(
+            *(enrich_one(entity) for entity in entities), return_exceptions=True
+        )
+
+        enriched = []
+        for entity, result in zip(entities, results):
+            if isinstance(result, Exception):
+                log.error(f"Error enriching {entity.name}: {result}")
+            elif result:
+                enriched.append(result)
 
         return enriched
 
@@ -131,62 +362,249 @@ class LLMEnricher:
 
         return None
 
-    def _build_enrichment_prompt(
-        self, entity: CodeEntity, context: Optional[Dict[str, Any]] = None
-    ) -> str:
-        """Build a prompt for enriching a code entity."""
-        entity_type = entity.type
+    @property
+    def supports_batch(self) -> bool:
+        """Whether enrich_entities_batch can use the provider's batch endpoint.
 
-        prompt = f"""Analyze this {entity_type} and provide a detailed description.
+        Custom base URLs usually point at proxies or local servers without one.
+        """
+        return self.llm_config.provider in BATCH_PROVIDERS and not self.llm_config.base_url
 
-Name: {entity.name}
-Type: {entity_type}
-File: {entity.file_path}
-"""
+    async def enrich_entities_batch(
+        self,
+        entities: List[CodeEntity],
+        context: Optional[Dict[str, Any]] = None,
+        poll_interval: float = 30.0,
+    ) -> List[EnrichedEntity]:
+        """Enrich entities through the provider's asynchronous batch API.
 
-        if entity.docstring:
-            prompt += f"\nExisting docstring: {entity.docstring}\n"
+        Batch jobs are billed at a discount and are not subject to per-request
+        rate limits, but may take minutes to hours to complete. Falls back to
+        enrich_entities when the provider has no batch endpoint.
+        """
+        if not self.supports_batch:
+            return await self.enrich_entities(entities, context)
+        if not self.enrichment_config.enabled or not entities:
+            return []
+        if not self._session:
+            raise RuntimeError("Session not initialized")
 
-        if entity.code:
-            prompt += f"\nCode:\n```python\n{entity.code}\n```\n"
+        return await self._enrich_unique(
+            entities, lambda unique: self._run_batch_job(unique, context, poll_interval)
+        )
+
+    async def _run_batch_job(
+        self,
+        entities: List[CodeEntity],
+        context: Optional[Dict[str, Any]],
+        poll_interval: float,
+    ) -> List[EnrichedEntity]:
+        """Submit one batch job for entities and parse its results."""
+        # Batch custom_ids are restricted to short identifiers, so key requests by index
+        prompts = {
+            f"entity-{i}": self._build_enrichment_prompt(entity, context)
+            for i, entity in enumerate(entities)
+        }
+        if self.llm_config.provider == "openai":
+            contents = await self._run_openai_batch(prompts, poll_interval)
+        else:
+            contents = await self._run_anthropic_batch(prompts, poll_interval)
+
+        enriched = []
+        for i, entity in enumerate(entities):
+            content = contents.get(f"entity-{i}")
+            if content is None:
+                continue
+            try:
+                response = json.loads(content)
+            except json.JSONDecodeError as e:
+                log.error(f"Error parsing batch response for {entity.name}: {e}")
+                continue
+            enriched.append(self._parse_enrichment_response(entity, response))
 
-        prompt += """
-Please provide:
-1. A clear, concise description of what this {entity_type} does (2-3 sentences)
+        return enriched
+
+    async def _run_openai_batch(
+        self, prompts: Dict[str, str], poll_interval: float
+    ) -> Dict[str, str]:
+        """Run prompts through the OpenAI Batch API, returning message content by custom_id."""
+        auth = {"Authorization": self._openai_headers()["Authorization"]}
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._openai_request_body(prompt),
+                }
+            )
+            for custom_id, prompt in prompts.items()
+        ]
+
+        form = aiohttp.FormData()
+        form.add_field("purpose", "batch")
+        form.add_field(
+            "file",
+            "\n".join(lines).encode("utf-8"),
+            filename="autodoc_enrichment.jsonl",
+            content_type="application/jsonl",
+        )
+        async with self._session.post(f"{OPENAI_API_URL}/files", headers=auth, data=form) as resp:
+            resp.raise_for_status()
+            input_file_id = (await resp.json())["id"]
+
+        async with self._session.post(
+            f"{OPENAI_API_URL}/batches",
+            headers=self._openai_headers(),
+            json={
+                "input_file_id": input_file_id,
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h",
+            },
+        ) as resp:
+            resp.raise_for_status()
+            batch = await resp.json()
+
+        while batch["status"] not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(poll_interval)
+            async with self._session.get(
+                f"{OPENAI_API_URL}/batches/{batch['id']}", headers=auth
+            ) as resp:
+                resp.raise_for_status()
+                batch = await resp.json()
+            log.debug(f"OpenAI batch {batch['id']}: {batch['status']}")
+
+        if batch["status"] != "completed" or not batch.get("output_file_id"):
+            log.error(f"OpenAI batch {batch['id']} ended with status {batch['status']}")
+            return {}
+
+        async with self._session.get(
+            f"{OPENAI_API_URL}/files/{batch['output_file_id']}/content", headers=auth
+        ) as resp:
+            resp.raise_for_status()
+            output = await resp.text()
+
+        contents = {}
+        for line in output.splitlines():
+            if not line:
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                log.error(
+                    f"OpenAI batch request {record['custom_id']} failed: {record.get('error')}"
+                )
+                continue
+            body = response["body"]
+            usage = body.get("usage", {})
+            self.total_input_tokens += usage.get("prompt_tokens", 0)
+            self.total_output_tokens += usage.get("completion_tokens", 0)
+            self.api_calls += 1
+            contents[record["custom_id"]] = body["choices"][0]["message"]["content"]
+        return contents
+
+    async def _run_anthropic_batch(
+        self, prompts: Dict[str, str], poll_interval: float
+    ) -> Dict[str, str]:
+        """Run prompts through the Anthropic Message Batches API, returning text by custom_id."""
+        headers = self._anthropic_headers()
+        requests = [
+            {"custom_id": custom_id, "params": self._anthropic_request_body(prompt)}
+            for custom_id, prompt in prompts.items()
+        ]
+
+        async with self._session.post(
+            f"{ANTHROPIC_API_URL}/messages/batches", headers=headers, json={"requests": requests}
+        ) as resp:
+            resp.raise_for_status()
+            batch = await resp.json()
+
+        while batch["processing_status"] != "ended":
+            await asyncio.sleep(poll_interval)
+            async with self._session.get(
+                f"{ANTHROPIC_API_URL}/messages/batches/{batch['id']}", headers=headers
+            ) as resp:
+                resp.raise_for_status()
+                batch = await resp.json()
+            log.debug(f"Anthropic batch {batch['id']}: {batch['processing_status']}")
+
+        if not batch.get("results_url"):
+            log.error(f"Anthropic batch {batch['id']} ended without results")
+            return {}
+
+        async with self._session.get(batch["results_url"], headers=headers) as resp:
+            resp.raise_for_status()
+            output = await resp.text()
+
+        contents = {}
+        for line in output.splitlines():
+            if not line:
+                continue
+            record = json.loads(line)
+            result = record["result"]
+            if result["type"] != "succeeded":
+                log.error(f"Anthropic batch request {record['custom_id']} {result['type']}")
+                continue
+            message = result["message"]
+            usage = message.get("usage", {})
+            self.total_input_tokens += usage.get("input_tokens", 0)
+            self.total_output_tokens += usage.get("output_tokens", 0)
+            self.api_calls += 1
+            contents[record["custom_id"]] = message["content"][0]["text"]
+        return contents
+
+    @cached_property
+    def _enrichment_instructions(self) -> str:
+        """The part of every enrichment prompt that does not depend on the entity.
+
+        Built once per enricher rather than for every entity.
+        """
+        instructions = """Please provide:
+1. A clear, concise description of what the entity does (2-3 sentences)
 2. The primary purpose or responsibility
 3. Key features or capabilities (as a list)
 """
 
         if self.enrichment_config.analyze_complexity:
-            prompt += "4. Any complexity or performance considerations\n"
+            instructions += "4. Any complexity or performance considerations\n"
 
         if self.enrichment_config.include_examples:
-            prompt += "5. 1-2 usage examples (if applicable)\n"
+            instructions += "5. 1-2 usage examples (if applicable)\n"
 
         if self.enrichment_config.detect_patterns:
-            prompt += "6. Any design patterns used\n"
+            instructions += "6. Any design patterns used\n"
 
-        prompt += "\nProvide the response in JSON format with keys: description, purpose, key_features, complexity_notes, usage_examples, design_patterns"
+        instructions += "\nProvide the response in JSON format with keys: description, purpose, key_features, complexity_notes, usage_examples, design_patterns\n"
 
-        return prompt
+        return instructions
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type(aiohttp.ClientError),
-        reraise=True,
-    )
-    async def _call_openai(self, prompt: str) -> Optional[Dict[str, Any]]:
-        """Call OpenAI API for enrichment."""
-        if not self._session:
-            raise RuntimeError("Session not initialized")
+    def _build_enrichment_prompt(
+        self, entity: CodeEntity, context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Build a prompt for enriching a code entity."""
+        prompt = f"""Analyze this {entity.type} and provide a detailed description.
 
-        api_key = self.llm_config.get_api_key()
-        url = self.llm_config.base_url or "https://api.openai.com/v1/chat/completions"
+Name: {entity.name}
+Type: {entity.type}
+File: {entity.file_path}
+"""
 
-        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        if entity.docstring:
+            prompt += f"\nExisting docstring: {entity.docstring}\n"
 
-        data = {
+        if entity.code:
+            prompt += f"\nCode:\n```python\n{entity.code}\n```\n"
+
+        return f"{prompt}\n{self._enrichment_instructions}"
+
+    def _openai_headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.llm_config.get_api_key()}",
+            "Content-Type": "application/json",
+        }
+
+    def _openai_request_body(self, prompt: str) -> Dict[str, Any]:
+        return {
             "model": self.llm_config.model,
             "messages": [
                 {
@@ -200,6 +618,37 @@ Please provide:
             "response_format": {"type": "json_object"},
         }
 
+    def _anthropic_headers(self) -> Dict[str, str]:
+        return {
+            "x-api-key": self.llm_config.get_api_key(),
+            "anthropic-version": "2023-06-01",
+            "Content-Type": "application/json",
+        }
+
+    def _anthropic_request_body(self, prompt: str) -> Dict[str, Any]:
+        return {
+            "model": self.llm_config.model or "claude-3-haiku-20240307",
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": self.llm_config.temperature,
+            "max_tokens": self.llm_config.max_tokens,
+            "system": "You are a code analysis expert. Provide clear, technical descriptions of code functionality. Always respond with valid JSON.",
+        }
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(aiohttp.ClientError),
+        reraise=True,
+    )
+    async def _call_openai(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """Call OpenAI API for enrichment."""
+        if not self._session:
+            raise RuntimeError("Session not initialized")
+
+        url = self.llm_config.base_url or f"{OPENAI_API_URL}/chat/completions"
+        headers = self._openai_headers()
+        data = self._openai_request_body(prompt)
+
         try:
             async with self._session.post(url, headers=headers, json=data) as resp:
                 if resp.status == 200:
@@ -234,22 +683,9 @@ Please provide:
         if not self._session:
             raise RuntimeError("Session not initialized")
 
-        api_key = self.llm_config.get_api_key()
-        url = self.llm_config.base_url or "https://api.anthropic.com/v1/messages"
-
-        headers = {
-            "x-api-key": api_key,
-            "anthropic-version": "2023-06-01",
-            "Content-Type": "application/json",
-        }
-
-        data = {
-            "model": self.llm_config.model or "claude-3-haiku-20240307",
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": self.llm_config.temperature,
-            "max_tokens": self.llm_config.max_tokens,
-            "system": "You are a code analysis expert. Provide clear, technical descriptions of code functionality. Always respond with valid JSON.",
-        }
+        url = self.llm_config.base_url or f"{ANTHROPIC_API_URL}/messages"
+        headers = self._anthropic_headers()
+        data = self._anthropic_request_body(prompt)
 
         try:
             async with self._session.post(url, headers=headers, json=data) as resp:
@@ -523,31 +959,109 @@ class PackSummaryCache:
 
 
 class EnrichmentCache:
-    """Cache for enriched entities."""
+    """Cache for enriched entities.
 
-    def __init__(self, cache_file: str = "autodoc_enrichment_cache.json"):
+    New enrichments are appended to a journal next to the cache file as they
+    arrive, so an interrupted run keeps them; save_cache folds the journal back
+    into the cache file.
+    """
+
+    def __init__(self, cache_file: str = "autodoc_enrichment_cache.json", journal: bool = True):
         self.cache_file = cache_file
+        self.journal_file = f"{cache_file}.journal"
+        self._journal_enabled = journal
+        self._journal = None
         self._cache: Dict[str, Dict[str, Any]] = {}
+        # True once enrichments have been added since the last load or save
+        self.dirty = False
+        # Guards the cache, dirty flag and journal handle against a concurrent save_cache
+        self._lock = threading.Lock()
         self._load_cache()
 
     def _load_cache(self):
-        """Load cache from file."""
+        """Load cache from file, replaying any journal left by an unsaved run."""
         try:
-            with open(self.cache_file, "r") as f:
-                self._cache = json.load(f)
+            with open(self.cache_file, "rb") as f:
+                raw = f.read()
+            data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+            # Keys are long "path:name:line" strings; interning them lets lookups
+            # by CodeEntity.cache_key succeed on an identity check
+            self._cache = {sys.intern(key): value for key, value in data.items()}
         except FileNotFoundError:
             self._cache = {}
         except Exception as e:
             log.error(f"Error loading enrichment cache: {e}")
             self._cache = {}
 
+        try:
+            with open(self.journal_file, "rb") as f:
+                for line in f:
+                    try:
+                        loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+                        key, enrichment = loads(line)
+                    except (TypeError, ValueError):
+                        # A run killed mid-write can leave a truncated last line
+                        continue
+                    self._cache[sys.intern(key)] = enrichment
+                    self.dirty = True
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            log.error(f"Error reading enrichment journal: {e}")
+
+    def _append_journal(self, enrichments: Dict[str, Dict[str, Any]]):
+        """Append enrichments to the journal; callers hold ``self._lock``."""
+        if not self._journal_enabled:
+            return
+        try:
+            if self._journal is None:
+                self._journal = open(self.journal_file, "ab")
+                if self._journal.tell():
+                    # Start on a fresh line in case a killed run left a partial one
+                    self._journal.write(b"\n")
+            if ORJSON_AVAILABLE:
+                lines = [orjson.dumps([key, value]) for key, value in enrichments.items()]
+            else:
+                lines = [json.dumps([key, value]).encode() for key, value in enrichments.items()]
+            self._journal.write(b"\n".join(lines) + b"\n")
+            self._journal.flush()
+        except OSError as e:
+            log.error(f"Error writing enrichment journal: {e}")
+
     def save_cache(self):
-        """Save cache to file."""
+        """Save cache to file and drop the journal it now includes.
+
+        Safe to run in a worker thread while enrichments are still being added:
+        it writes a snapshot, and anything added meanwhile leaves the cache dirty
+        and keeps the journal that records it.
+        """
+        with self._lock:
+            self.dirty = False
+            snapshot = dict(self._cache)
         try:
-            with open(self.cache_file, "w") as f:
-                json.dump(self._cache, f, indent=2)
+            if ORJSON_AVAILABLE:
+                with open(self.cache_file, "wb") as f:
+                    f.write(orjson.dumps(snapshot, option=orjson.OPT_INDENT_2))
+            else:
+                with open(self.cache_file, "w") as f:
+                    json.dump(snapshot, f, indent=2)
         except Exception as e:
+            with self._lock:
+                self.dirty = True
             log.error(f"Error saving enrichment cache: {e}")
+            return
+
+        with self._lock:
+            if self.dirty:
+                return
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            if self._journal_enabled:
+                try:
+                    os.remove(self.journal_file)
+                except FileNotFoundError:
+                    pass
 
     def get_enrichment(self, entity_key: str) -> Optional[Dict[str, Any]]:
         """Get cached enrichment for an entity."""
@@ -555,9 +1069,25 @@ class EnrichmentCache:
 
     def set_enrichment(self, entity_key: str, enrichment: Dict[str, Any]):
         """Cache enrichment for an entity."""
-        self._cache[entity_key] = enrichment
+        with self._lock:
+            self._cache[entity_key] = enrichment
+            self.dirty = True
+            self._append_journal({entity_key: enrichment})
+
+    def set_enrichments(self, enrichments: Dict[str, Dict[str, Any]]):
+        """Cache enrichments for many entities at once."""
+        if enrichments:
+            with self._lock:
+                self._cache.update(enrichments)
+                self.dirty = True
+                self._append_journal(enrichments)
+
+    def key_set(self) -> FrozenSet[str]:
+        """Snapshot the keys that have a cached enrichment, for bulk membership tests."""
+        return frozenset(key for key, enrichment in self._cache.items() if enrichment)
 
     def clear(self):
         """Clear the cache."""
-        self._cache = {}
+        with self._lock:
+            self._cache = {}
         self.save_cache()
@@ -4,12 +4,16 @@ Inline enrichment functionality for adding enriched docstrings directly to code
 """
 
 import ast
+import asyncio
 import hashlib
+import io
 import json
+import os
+import shutil
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 from rich.console import Console
 from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
@@ -20,6 +24,17 @@ from .enrichment import EnrichmentCache, LLMEnricher
 
 console = Console()
 
+# Rewriting source files is disk-bound, so allow more files in flight than LLM requests
+INLINE_IO_CONCURRENCY = 16
+
+
+def group_entities_by_file(entities: List[CodeEntity]) -> Dict[str, List[CodeEntity]]:
+    """Group entities by file path, preserving their original order."""
+    files_entities: Dict[str, List[CodeEntity]] = {}
+    for entity in entities:
+        files_entities.setdefault(entity.file_path, []).append(entity)
+    return files_entities
+
 
 @dataclass
 class FileChangeInfo:
@@ -230,17 +245,15 @@ class ChangeDetector:
         )
         self._save_cache()
 
-    def get_changed_files(self, entities: List[CodeEntity]) -> Set[str]:
+    def get_changed_files(
+        self,
+        entities: List[CodeEntity],
+        entities_by_file: Optional[Dict[str, List[CodeEntity]]] = None,
+    ) -> Set[str]:
         """Get list of files that have changed."""
         changed_files = set()
 
-        # Group entities by file
-        files_entities = {}
-        for entity in entities:
-            if entity.file_path not in files_entities:
-                files_entities[entity.file_path] = []
-            files_entities[entity.file_path].append(entity)
-
+        files_entities = entities_by_file or group_entities_by_file(entities)
         for file_path, file_entities in files_entities.items():
             path = Path(file_path)
             if self.has_changed(path, file_entities):
@@ -267,14 +280,17 @@ class InlineEnricher:
         self.backup = backup
         self.dry_run = dry_run
         self.change_detector = ChangeDetector()
+        self._io_semaphore = asyncio.Semaphore(INLINE_IO_CONCURRENCY)
 
-    def _backup_file(self, file_path: Path):
-        """Create backup of original file."""
+    def _backup_file(self, file_path: Path, content: Optional[str] = None):
+        """Create backup of original file, reusing ``content`` if it was already read."""
         if not self.backup or self.dry_run:
             return
 
+        if content is None:
+            content = file_path.read_text(encoding="utf-8")
         backup_path = file_path.with_suffix(f"{file_path.suffix}.autodoc_backup")
-        backup_path.write_text(file_path.read_text(encoding="utf-8"), encoding="utf-8")
+        backup_path.write_text(content, encoding="utf-8")
 
     def _parse_python_file(self, file_path: Path) -> Optional[ast.AST]:
         """Parse Python file to AST."""
@@ -286,13 +302,13 @@ class InlineEnricher:
             console.print(f"[red]Error parsing {file_path}: {e}[/red]")
             return None
 
-    def _find_entity_node(self, tree: ast.AST, entity: CodeEntity) -> Optional[ast.AST]:
-        """Find the AST node for a given entity."""
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                if node.name == entity.name and node.lineno == entity.line_number:
-                    return node
-        return None
+    def _index_entity_nodes(self, tree: ast.AST) -> Dict[Tuple[str, int], ast.AST]:
+        """Map (name, line number) to each function/class node in a single walk."""
+        return {
+            (node.name, node.lineno): node
+            for node in ast.walk(tree)
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+        }
 
     def _get_existing_docstring(self, node: ast.AST) -> Optional[str]:
         """Get existing docstring from AST node."""
@@ -357,32 +373,36 @@ class InlineEnricher:
             skipped_entities=[],
         )
 
-        # Read original file
+        # Read original file once; parsing and the backup reuse the same content
         try:
             with open(file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+                content = f.read()
         except Exception as e:
             result.errors.append(f"Could not read file: {e}")
             return result
+        lines = io.StringIO(content).readlines()
 
         # Parse AST
-        tree = self._parse_python_file(file_path)
-        if not tree:
+        try:
+            tree = ast.parse(content)
+        except Exception as e:
+            console.print(f"[red]Error parsing {file_path}: {e}[/red]")
             result.errors.append("Could not parse file")
             return result
+        nodes = self._index_entity_nodes(tree)
 
         # Create backup
-        self._backup_file(file_path)
+        self._backup_file(file_path, content)
 
         # Track changes
         updated_lines = lines.copy()
 
-        # Sort entities by line number (reverse order for safe insertion)
+        # Walk entities by line number in reverse order for safe insertion, without
+        # reordering the caller's list (it is shared with module file generation)
         file_entities = [e for e in entities if e.file_path == str(file_path)]
-        file_entities.sort(key=lambda x: x.line_number, reverse=True)
 
-        for entity in file_entities:
-            cache_key = f"{entity.file_path}:{entity.name}:{entity.line_number}"
+        for entity in sorted(file_entities, key=lambda x: x.line_number, reverse=True):
+            cache_key = entity.cache_key
             enrichment = enrichments.get(cache_key)
 
             if not enrichment or not enrichment.get("description"):
@@ -390,7 +410,7 @@ class InlineEnricher:
                 continue
 
             # Find AST node
-            node = self._find_entity_node(tree, entity)
+            node = nodes.get((entity.name, entity.line_number))
             if not node:
                 result.errors.append(f"Could not find AST node for {entity.name}")
                 continue
@@ -457,12 +477,17 @@ class InlineEnricher:
             result.enriched_entities.append(entity.name)
             result.updated_docstrings += 1
 
-        # Write updated file
+        # Write updated file; go through a temporary file so an interrupted run
+        # never leaves a truncated source file behind
         if not self.dry_run:
+            tmp_path = file_path.with_name(f".{file_path.name}.autodoc_tmp")
             try:
-                with open(file_path, "w", encoding="utf-8") as f:
+                with open(tmp_path, "w", encoding="utf-8") as f:
                     f.writelines(updated_lines)
+                shutil.copymode(file_path, tmp_path)
+                os.replace(tmp_path, file_path)
             except Exception as e:
+                tmp_path.unlink(missing_ok=True)
                 result.errors.append(f"Could not write file: {e}")
                 return result
         else:
@@ -471,35 +496,65 @@ class InlineEnricher:
 
         return result
 
+    async def rewrite_file(
+        self, file_path: Path, file_entities: List[CodeEntity], enrichments: Dict[str, Dict]
+    ) -> InlineEnrichmentResult:
+        """Write already available enrichments for one file's entities into it as docstrings."""
+        async with self._io_semaphore:
+            result = await asyncio.to_thread(
+                self._update_file_with_docstrings, file_path, file_entities, enrichments
+            )
+
+        # Mark file as processed
+        if result.updated_docstrings > 0:
+            self.change_detector.mark_processed(file_path, file_entities)
+            console.print(
+                f"[green]✅ Updated {result.updated_docstrings} docstrings in {file_path.name}[/green]"
+            )
+        else:
+            console.print(f"[yellow]No updates needed for {file_path.name}[/yellow]")
+
+        return result
+
     async def enrich_files_inline(
-        self, entities: List[CodeEntity], incremental: bool = True, force: bool = False
+        self,
+        entities: List[CodeEntity],
+        incremental: bool = True,
+        force: bool = False,
+        entities_by_file: Optional[Dict[str, List[CodeEntity]]] = None,
     ) -> List[InlineEnrichmentResult]:
-        """Enrich files with inline docstrings."""
+        """Enrich files with inline docstrings.
+
+        ``entities_by_file`` may be passed when the caller has already grouped
+        ``entities`` with :func:`group_entities_by_file`.
+        """
         results = []
+        if entities_by_file is None:
+            entities_by_file = group_entities_by_file(entities)
 
         # Determine which files to process
         if incremental and not force:
-            changed_files = self.change_detector.get_changed_files(entities)
+            changed_files = self.change_detector.get_changed_files(entities, entities_by_file)
             if not changed_files:
                 console.print("[green]No files have changed since last enrichment[/green]")
                 return results
+            files_entities = {
+                file_path: file_entities
+                for file_path, file_entities in entities_by_file.items()
+                if file_path in changed_files
+            }
         else:
-            changed_files = set(e.file_path for e in entities)
+            files_entities = entities_by_file
 
-        console.print(f"[blue]Processing {len(changed_files)} files for inline enrichment[/blue]")
+        console.print(f"[blue]Processing {len(files_entities)} files for inline enrichment[/blue]")
 
         # Load existing enrichment cache
         enrichment_cache = EnrichmentCache()
 
-        # Group entities by file
-        files_entities = {}
-        for entity in entities:
-            if entity.file_path in changed_files:
-                if entity.file_path not in files_entities:
-                    files_entities[entity.file_path] = []
-                files_entities[entity.file_path].append(entity)
+        # Files are independent, so process several at once; the LLM calls overlap
+        # on the event loop and the blocking read/parse/rewrite runs in a thread
+        semaphore = asyncio.Semaphore(self.config.enrichment.max_concurrency)
 
-        # Process each file with progress bar
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -509,68 +564,71 @@ class InlineEnricher:
         ) as progress:
             task = progress.add_task("[cyan]Processing files...", total=len(files_entities))
 
-            for file_path, file_entities in files_entities.items():
+            async def process_file(
+                file_path: str, file_entities: List[CodeEntity]
+            ) -> Optional[InlineEnrichmentResult]:
                 path = Path(file_path)
 
                 if not path.exists() or path.suffix != ".py":
-                    continue
-
-                progress.update(task, description=f"[cyan]Enriching {path.name}...")
-
-                # Get enrichments for entities in this file
-                enrichments = {}
-                entities_to_enrich = []
-
-                for entity in file_entities:
-                    cache_key = f"{entity.file_path}:{entity.name}:{entity.line_number}"
-                    existing_enrichment = enrichment_cache.get_enrichment(cache_key)
-
-                    if existing_enrichment and not force:
-                        enrichments[cache_key] = existing_enrichment
-                    else:
-                        entities_to_enrich.append(entity)
-
-                # Enrich missing entities
-                if entities_to_enrich:
-                    try:
-                        async with LLMEnricher(self.config) as enricher:
-                            enriched = await enricher.enrich_entities(entities_to_enrich)
-
-                            for enriched_entity in enriched:
-                                cache_key = f"{enriched_entity.entity.file_path}:{enriched_entity.entity.name}:{enriched_entity.entity.line_number}"
-                                enrichment_data = {
-                                    "description": enriched_entity.description,
-                                    "purpose": enriched_entity.purpose,
-                                    "key_features": enriched_entity.key_features,
-                                    "complexity_notes": enriched_entity.complexity_notes,
-                                    "usage_examples": enriched_entity.usage_examples,
-                                    "design_patterns": enriched_entity.design_patterns,
-                                    "dependencies": enriched_entity.dependencies,
-                                }
-                                enrichments[cache_key] = enrichment_data
-                                enrichment_cache.set_enrichment(cache_key, enrichment_data)
-
-                    except Exception as e:
-                        console.print(f"[red]Error enriching entities in {path.name}: {e}[/red]")
-                        continue
-
-                # Update file with docstrings
-                result = self._update_file_with_docstrings(path, file_entities, enrichments)
-                results.append(result)
-
-                # Mark file as processed
-                if result.updated_docstrings > 0:
-                    self.change_detector.mark_processed(path, file_entities)
-                    console.print(
-                        f"[green]✅ Updated {result.updated_docstrings} docstrings in {path.name}[/green]"
-                    )
-                else:
-                    console.print(f"[yellow]No updates needed for {path.name}[/yellow]")
+                    return None
+
+                async with semaphore:
+                    progress.update(task, description=f"[cyan]Enriching {path.name}...")
+
+                    # Get enrichments for entities in this file
+                    enrichments = {}
+                    entities_to_enrich = []
 
+                    for entity in file_entities:
+                        cache_key = entity.cache_key
+                        existing_enrichment = enrichment_cache.get_enrichment(cache_key)
+
+                        if existing_enrichment and not force:
+                            enrichments[cache_key] = existing_enrichment
+                        else:
+                            entities_to_enrich.append(entity)
+
+                    # Enrich missing entities
+                    if entities_to_enrich:
+                        try:
+                            async with LLMEnricher(self.config) as enricher:
+                                enriched = await enricher.enrich_entities(entities_to_enrich)
+
+                                for enriched_entity in enriched:
+                                    cache_key = enriched_entity.entity.cache_key
+                                    enrichment_data = {
+                                        "description": enriched_entity.description,
+                                        "purpose": enriched_entity.purpose,
+                                        "key_features": enriched_entity.key_features,
+                                        "complexity_notes": enriched_entity.complexity_notes,
+                                        "usage_examples": enriched_entity.usage_examples,
+                                        "design_patterns": enriched_entity.design_patterns,
+                                        "dependencies": enriched_entity.dependencies,
+                                    }
+                                    enrichments[cache_key] = enrichment_data
+                                    enrichment_cache.set_enrichment(cache_key, enrichment_data)
+
+                        except Exception as e:
+                            console.print(
+                                f"[red]Error enriching entities in {path.name}: {e}[/red]"
+                            )
+                            return None
+
+                result = await self.rewrite_file(path, file_entities, enrichments)
                 progress.advance(task)
+                return result
 
-        # Save enrichment cache
-        enrichment_cache.save_cache()
+            file_results = await asyncio.gather(
+                *(
+                    process_file(file_path, file_entities)
+                    for file_path, file_entities in files_entities.items()
+                )
+            )
+            results.extend(result for result in file_results if result is not None)
+
+        # Save enrichment cache if anything was added to it
+        if enrichment_cache.dirty:
+            enrichment_cache.save_cache()
 
         return results
 
@@ -610,62 +668,83 @@ class ModuleEnrichmentGenerator:
         }
 
     async def generate_module_enrichment_files(
-        self, entities: List[CodeEntity], output_format: str = "markdown"
+        self,
+        entities: List[CodeEntity],
+        output_format: str = "markdown",
+        entities_by_file: Optional[Dict[str, List[CodeEntity]]] = None,
     ) -> List[str]:
-        """Generate module-level enrichment files."""
+        """Generate module-level enrichment files.
+
+        ``entities_by_file`` may be passed when the caller has already grouped
+        ``entities`` with :func:`group_entities_by_file`.
+        """
         generated_files = []
 
-        # Group entities by file
-        files_entities = {}
-        for entity in entities:
-            if entity.file_path not in files_entities:
-                files_entities[entity.file_path] = []
-            files_entities[entity.file_path].append(entity)
+        files_entities = entities_by_file or group_entities_by_file(entities)
 
         enrichment_cache = EnrichmentCache()
 
-        for file_path, file_entities in files_entities.items():
-            path = Path(file_path)
+        # Each module file is rendered and written independently, so fan the
+        # blocking work out to threads
+        written = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    self._write_module_enrichment_file,
+                    file_path,
+                    file_entities,
+                    enrichment_cache,
+                    output_format,
+                )
+                for file_path, file_entities in files_entities.items()
+                if file_path.endswith(".py")
+            )
+        )
+        generated_files.extend(output_file for output_file in written if output_file)
 
-            if path.suffix != ".py":
-                continue
+        return generated_files
 
-            # Generate module overview
-            overview = self._generate_module_overview(file_path, file_entities)
+    def _write_module_enrichment_file(
+        self,
+        file_path: str,
+        file_entities: List[CodeEntity],
+        enrichment_cache: EnrichmentCache,
+        output_format: str,
+    ) -> Optional[str]:
+        """Render and write the enrichment file for one module."""
+        path = Path(file_path)
 
-            # Collect enrichments
-            enriched_entities = []
-            for entity in file_entities:
-                cache_key = f"{entity.file_path}:{entity.name}:{entity.line_number}"
-                enrichment = enrichment_cache.get_enrichment(cache_key)
+        # Generate module overview
+        overview = self._generate_module_overview(file_path, file_entities)
 
-                if enrichment:
-                    enriched_entities.append({"entity": entity, "enrichment": enrichment})
+        # Collect enrichments
+        enriched_entities = []
+        for entity in file_entities:
+            enrichment = enrichment_cache.get_enrichment(entity.cache_key)
 
-            # Generate output file
-            if output_format == "markdown":
-                output_file = path.with_suffix(".enrichment.md")
-                content = self._generate_markdown_enrichment(
-                    overview, enriched_entities, file_entities
-                )
-            else:  # JSON
-                output_file = path.with_suffix(".enrichment.json")
-                content = self._generate_json_enrichment(overview, enriched_entities, file_entities)
-
-            # Write file
-            if not self.dry_run:
-                try:
-                    with open(output_file, "w", encoding="utf-8") as f:
-                        f.write(content)
-                    generated_files.append(str(output_file))
-                    console.print(f"[green]Generated {output_file.name}[/green]")
-                except Exception as e:
-                    console.print(f"[red]Error generating {output_file}: {e}[/red]")
-            else:
-                generated_files.append(str(output_file))
-                console.print(f"[blue]DRY RUN: Would generate {output_file.name}[/blue]")
+            if enrichment:
+                enriched_entities.append({"entity": entity, "enrichment": enrichment})
 
-        return generated_files
+        # Generate output file
+        if output_format == "markdown":
+            output_file = path.with_suffix(".enrichment.md")
+            content = self._generate_markdown_enrichment(overview, enriched_entities, file_entities)
+        else:  # JSON
+            output_file = path.with_suffix(".enrichment.json")
+            content = self._generate_json_enrichment(overview, enriched_entities, file_entities)
+
+        # Write file
+        if self.dry_run:
+            console.print(f"[blue]DRY RUN: Would generate {output_file.name}[/blue]")
+            return str(output_file)
+
+        try:
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(content)
+        except Exception as e:
+            console.print(f"[red]Error generating {output_file}: {e}[/red]")
+            return None
+        console.print(f"[green]Generated {output_file.name}[/green]")
+        return str(output_file)
 
     def _generate_markdown_enrichment(
         self, overview: Dict, enriched_entities: List, all_entities: List[CodeEntity]
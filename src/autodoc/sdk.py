@@ -117,13 +117,8 @@ def _run_async(coro):
         nest_asyncio.apply()
         return loop.run_until_complete(coro)
     except RuntimeError:
-        # No running loop, create one
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(coro)
-        finally:
-            loop.close()
+        # No running loop; asyncio.run creates and tears one down for us
+        return asyncio.run(coro)
 
 
 class Autodoc:
@@ -464,6 +464,10 @@ class MarkdownFormatter:
 
     def format_summary_markdown(self, summary: Dict[str, Any]) -> str:
         """Format comprehensive summary as detailed Markdown optimized for LLM context."""
+        return "\n".join(self.format_summary_markdown_lines(summary))
+
+    def format_summary_markdown_lines(self, summary: Dict[str, Any]) -> List[str]:
+        """Build the Markdown summary as a list of lines (joined with newlines)."""
         md = []
 
         # Header with metadata
@@ -635,7 +639,7 @@ class MarkdownFormatter:
             "*For the most up-to-date information, regenerate this document after code changes.*"
         )
 
-        return "\n".join(md)
+        return md
 
     def _add_remaining_sections(self, md: List[str], summary: Dict[str, Any]) -> None:
         """Add remaining sections like project structure, feature map, etc."""
@@ -10,7 +10,7 @@ from typing import Dict, List, Optional
 
 from rich.console import Console
 
-from .analyzer import CodeEntity
+from .analyzer import CodeEntity, is_excluded
 
 console = Console()
 
@@ -22,6 +22,19 @@ try:
 except ImportError:
     TREE_SITTER_AVAILABLE = False
 
+# Directory names skipped when walking a project for TypeScript files
+TS_DEFAULT_EXCLUDES = [
+    "node_modules",
+    ".git",
+    "dist",
+    "build",
+    "coverage",
+    ".next",
+    ".nuxt",
+    ".output",
+    "__pycache__",
+]
+
 
 @dataclass
 class TypeScriptEntity(CodeEntity):
@@ -157,38 +170,12 @@ class TypeScriptAnalyzer:
 
         console.print(f"[blue]Analyzing TypeScript files in {path}...[/blue]")
 
-        # Default exclude patterns
-        default_excludes = [
-            "node_modules",
-            ".git",
-            "dist",
-            "build",
-            "coverage",
-            ".next",
-            ".nuxt",
-            ".output",
-            "__pycache__",
-        ]
-
         # Find TypeScript files
-        ts_files = list(path.rglob("*.ts")) + list(path.rglob("*.tsx"))
-
-        # Filter files
-        filtered_files = []
-        for f in ts_files:
-            # Skip if in default exclude directories
-            if any(skip in f.parts for skip in default_excludes):
-                continue
-
-            # Skip if matches exclude patterns
-            if exclude_patterns:
-                relative_path = f.relative_to(path)
-                if any(relative_path.match(pattern) for pattern in exclude_patterns):
-                    continue
-
-            filtered_files.append(f)
-
-        ts_files = filtered_files
+        ts_files = [
+            f
+            for f in [*path.rglob("*.ts"), *path.rglob("*.tsx")]
+            if not is_excluded(f, path, exclude_patterns, TS_DEFAULT_EXCLUDES)
+        ]
 
         console.print(f"Found {len(ts_files)} TypeScript files")
 
@@ -17,6 +17,7 @@ from autodoc.inline_enrichment import (
     InlineEnricher,
     InlineEnrichmentResult,
     ModuleEnrichmentGenerator,
+    group_entities_by_file,
 )
 
 
@@ -177,6 +178,32 @@ class TestInlineEnricher:
         assert "Examples:" in docstring
         assert "Complexity:" in docstring
 
+    def test_update_file_with_docstrings(self, sample_python_file, sample_entities, mock_config):
+        """Test docstrings are written in place without leaving temporary files."""
+        enricher = InlineEnricher(mock_config, backup=True)
+        enrichments = {
+            entity.cache_key: {"description": f"Describes {entity.name}"}
+            for entity in sample_entities
+        }
+
+        original_order = list(sample_entities)
+
+        result = enricher._update_file_with_docstrings(
+            sample_python_file, sample_entities, enrichments
+        )
+
+        assert sample_entities == original_order
+        assert result.errors == []
+        assert result.updated_docstrings == 3
+        content = sample_python_file.read_text()
+        assert '    """Describes add_numbers"""' in content
+        assert '        """Describes multiply"""' in content
+        assert sample_python_file.with_suffix(".py.autodoc_backup").exists()
+        assert sorted(p.name for p in sample_python_file.parent.iterdir()) == [
+            "sample.py",
+            "sample.py.autodoc_backup",
+        ]
+
     @pytest.mark.asyncio
     async def test_enrich_files_inline_mock(self, sample_python_file, sample_entities, mock_config):
         """Test inline enrichment with mocked LLM."""
@@ -214,6 +241,24 @@ class TestInlineEnricher:
             assert result.file_path == str(sample_python_file)
 
 
+def test_group_entities_by_file(sample_entities):
+    """Test grouping entities by file keeps each file's entities in order."""
+    other = CodeEntity(
+        type="function",
+        name="other",
+        file_path="/other.py",
+        line_number=1,
+        docstring=None,
+        code="def other(): pass",
+    )
+
+    grouped = group_entities_by_file([*sample_entities, other])
+
+    assert list(grouped) == [sample_entities[0].file_path, "/other.py"]
+    assert grouped[sample_entities[0].file_path] == sample_entities
+    assert grouped["/other.py"] == [other]
+
+
 class TestModuleEnrichmentGenerator:
     """Test module enrichment file generation."""
 
@@ -4,9 +4,10 @@ Tests for the analyzer module
 """
 
 import tempfile
+from dataclasses import asdict
 from pathlib import Path
 
-from autodoc.analyzer import CodeEntity, SimpleASTAnalyzer
+from autodoc.analyzer import CodeEntity, SimpleASTAnalyzer, is_excluded
 
 
 class TestCodeEntity:
@@ -41,6 +42,30 @@ class TestCodeEntity:
 
         assert entity.embedding == embedding
 
+    def test_code_entity_cache_key(self):
+        entity = CodeEntity(
+            type="function",
+            name="test_func",
+            file_path="/path/to/file.py",
+            line_number=10,
+            docstring=None,
+            code="def test_func(): pass",
+        )
+
+        assert entity.cache_key == "/path/to/file.py:test_func:10"
+        assert "cache_key" not in asdict(entity)
+
+
+def test_is_excluded():
+    root = Path("/project")
+
+    assert not is_excluded(root / "src" / "app.py", root)
+    assert is_excluded(root / ".venv" / "site.py", root)
+    assert is_excluded(root / "src" / "__pycache__" / "app.py", root)
+    assert is_excluded(root / "src" / "gen_pb2.py", root, ["*_pb2.py"])
+    # Only the part of the path below the root is considered
+    assert not is_excluded(Path("/build/project/app.py"), Path("/build/project"))
+
 
 class TestSimpleASTAnalyzer:
     """Test AST analyzer functionality"""
@@ -3,7 +3,7 @@
 Tests for the main autodoc module
 """
 
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
@@ -52,6 +52,25 @@ class TestSimpleAutodoc:
             assert summary["has_embeddings"] is True
             assert all(e.embedding is not None for e in autodoc.entities)
 
+    @pytest.mark.asyncio
+    async def test_analyze_single_file(self, sample_project_dir, monkeypatch):
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+        from autodoc.config import AutodocConfig, EmbeddingsConfig
+
+        config = AutodocConfig(embeddings=EmbeddingsConfig(provider="openai"))
+
+        with patch("autodoc.embedder.OpenAIEmbedder.embed_batch") as mock_embed:
+            mock_embed.return_value = [[0.1, 0.2] for _ in range(20)]
+
+            autodoc = SimpleAutodoc(config=config)
+            file_path = sample_project_dir / "src" / "module.py"
+            summary = await autodoc.analyze_directory(file_path)
+
+            assert summary["files_analyzed"] == 1
+            assert summary["total_entities"] > 0
+            assert {e.file_path for e in autodoc.entities} == {str(file_path)}
+
     def test_save_and_load(self, tmp_path):
         autodoc = SimpleAutodoc()
 
@@ -73,6 +92,7 @@ class TestSimpleAutodoc:
         autodoc.save(str(cache_file))
 
         assert cache_file.exists()
+        assert not (tmp_path / "test_cache.json.tmp").exists()
 
         # Load into new instance
         new_autodoc = SimpleAutodoc()
@@ -82,6 +102,75 @@ class TestSimpleAutodoc:
         assert new_autodoc.entities[0].name == "test_func"
         assert new_autodoc.entities[0].embedding == [0.1, 0.2]
 
+    def test_save_and_load_int8_quantized(self, tmp_path):
+        """Test that opting into int8 storage round-trips embeddings approximately"""
+        from autodoc.config import AutodocConfig, EmbeddingsConfig
+
+        config = AutodocConfig(embeddings=EmbeddingsConfig(cache_quantization="int8"))
+        autodoc = SimpleAutodoc(config=config)
+        autodoc.entities = [
+            CodeEntity(
+                type="function",
+                name="test_func",
+                file_path="/test.py",
+                line_number=1,
+                docstring="Test",
+                code="def test_func(): pass",
+                embedding=[0.1, 0.2],
+            )
+        ]
+
+        cache_file = tmp_path / "test_cache.json"
+        autodoc.save(str(cache_file))
+
+        new_autodoc = SimpleAutodoc()
+        new_autodoc.load(str(cache_file))
+
+        assert new_autodoc.entities[0].embedding == pytest.approx([0.1, 0.2], abs=1e-2)
+
+    def test_save_and_load_without_orjson(self, tmp_path, monkeypatch):
+        """Test that the cache round-trips through the stdlib json fallback"""
+        monkeypatch.setattr("autodoc.autodoc.ORJSON_AVAILABLE", False)
+        autodoc = SimpleAutodoc()
+        autodoc.entities = [
+            CodeEntity(
+                type="class",
+                name="TestClass",
+                file_path="/test.py",
+                line_number=3,
+                docstring=None,
+                code="class TestClass: pass",
+            )
+        ]
+
+        cache_file = tmp_path / "test_cache.json"
+        autodoc.save(str(cache_file))
+
+        new_autodoc = SimpleAutodoc()
+        new_autodoc.load(str(cache_file))
+
+        assert [e.name for e in new_autodoc.entities] == ["TestClass"]
+
+    def test_load_from_dict_ignores_unknown_fields(self):
+        autodoc = SimpleAutodoc()
+        autodoc.load_from_dict(
+            {
+                "entities": [
+                    {
+                        "type": "function",
+                        "name": "imported_func",
+                        "file_path": "/test.py",
+                        "line_number": 7,
+                        "docstring": None,
+                        "code": "def imported_func(): pass",
+                        "unknown_field": "ignored",
+                    }
+                ]
+            }
+        )
+
+        assert [e.name for e in autodoc.entities] == ["imported_func"]
+
     @pytest.mark.asyncio
     async def test_search_with_embeddings(self, sample_code_entities):
         autodoc = SimpleAutodoc()
@@ -222,3 +311,34 @@ class TestSimpleAutodoc:
         autodoc = SimpleAutodoc(config=config)
         assert autodoc.embedder is not None
         assert autodoc.analyzer is not None
+
+    def test_extract_imports_memoized(self, tmp_path, monkeypatch):
+        """Test that unchanged files are not re-parsed for imports"""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        source = tmp_path / "mod.py"
+        source.write_text("import os\nfrom pathlib import Path\n")
+
+        autodoc = SimpleAutodoc()
+        with patch.object(autodoc, "_parse_imports", wraps=autodoc._parse_imports) as parse:
+            first = autodoc._extract_imports(str(source))
+            second = autodoc._extract_imports(str(source))
+
+        assert first == second == ["import os", "from pathlib import Path"]
+        assert parse.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_search_reuses_embedding_matrix(self, sample_code_entities):
+        """Test that repeated searches share one embedding matrix until entities change"""
+        autodoc = SimpleAutodoc()
+        autodoc.entities = sample_code_entities
+        autodoc.embedder = Mock()
+        autodoc.embedder.embed = AsyncMock(return_value=[0.8, 0.2])
+
+        await autodoc.search("data processing", limit=2)
+        matrix, _ = autodoc._embedding_matrix_cache
+        await autodoc.search("data processing", limit=2)
+        assert autodoc._embedding_matrix_cache[0] is matrix
+
+        autodoc.entities = list(sample_code_entities)
+        await autodoc.search("data processing", limit=2)
+        assert autodoc._embedding_matrix_cache[0] is not matrix
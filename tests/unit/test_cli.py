@@ -76,6 +76,32 @@ class TestCLIIntegration:
             assert result.exit_code == 0
             assert "No analyzed code found" in result.output
 
+    def test_search_command_piped_output(self, monkeypatch):
+        """Test that search prints tab-separated rows when stdout is not a terminal"""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        cache_data = {
+            "entities": [
+                {
+                    "type": "function",
+                    "name": "parse_file",
+                    "file_path": "src/parser.py",
+                    "line_number": 3,
+                    "docstring": "Parse a file",
+                    "code": "def parse_file():",
+                    "embedding": None,
+                }
+            ]
+        }
+
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            Path("autodoc_cache.json").write_text(json.dumps(cache_data))
+
+            result = runner.invoke(cli, ["search", "parse"])
+
+            assert result.exit_code == 0
+            assert "function\tparse_file\tsrc/parser.py\t" in result.output
+
     def test_help_command(self):
         """Test that help command works"""
         runner = CliRunner()
@@ -153,3 +179,129 @@ class TestCLICommands:
             # Test Markdown format (default)
             result = runner.invoke(cli, ["generate-summary", "--format", "markdown"])
             assert result.exit_code == 0
+
+    def test_diff_command(self):
+        """Test diff reports added, removed and modified entities"""
+
+        def entity(name, line, file_path="src/app.py"):
+            return {
+                "type": "function",
+                "name": name,
+                "file_path": file_path,
+                "line_number": line,
+                "docstring": None,
+                "code": f"def {name}():",
+            }
+
+        new_cache = {"entities": [entity("kept", 1), entity("moved", 20), entity("added", 30)]}
+        old_cache = {"entities": [entity("kept", 1), entity("moved", 10), entity("gone", 40)]}
+
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            Path("new.json").write_text(json.dumps(new_cache))
+            Path("old.json").write_text(json.dumps(old_cache))
+
+            result = runner.invoke(cli, ["diff", "new.json", "old.json", "--detailed"])
+
+            assert result.exit_code == 0
+            assert "Added: 1" in result.output
+            assert "Removed: 1" in result.output
+            assert "Modified: 1" in result.output
+            assert "Unchanged: 1" in result.output
+            assert "+ function added in app.py" in result.output
+            assert "- function gone in app.py" in result.output
+            assert "Line: 10 → 20" in result.output
+
+    def test_test_map_command(self):
+        """Test test-map links test functions to the functions they call"""
+
+        def entity(name, file_path, code):
+            return {
+                "type": "function",
+                "name": name,
+                "file_path": file_path,
+                "line_number": 1,
+                "docstring": None,
+                "code": code,
+            }
+
+        cache_data = {
+            "entities": [
+                entity("parse", "src/parser.py", "def parse(text):"),
+                entity("render", "src/render.py", "def render(tree):"),
+                entity("test_parse", "tests/test_parser.py", "def test_parse():\n    parse('x')"),
+            ]
+        }
+
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            Path("autodoc_cache.json").write_text(json.dumps(cache_data))
+
+            result = runner.invoke(cli, ["test-map", "--format", "json", "--output", "map.json"])
+
+            assert result.exit_code == 0
+            mapping = json.loads(Path("map.json").read_text())
+            assert mapping["test_mapping"] == {
+                "tests/test_parser.py::test_parse": [
+                    {"name": "parse", "file": "src/parser.py", "line": 1}
+                ]
+            }
+            assert [f["name"] for f in mapping["untested_functions"]] == ["render"]
+            assert mapping["summary"]["total_functions"] == 2
+
+
+class TestEmbeddingHelpers:
+    """Test CLI embedding helpers"""
+
+    def test_embed_texts_concurrently_maps_each_text(self):
+        from unittest.mock import AsyncMock, Mock
+
+        from autodoc.cli import _embed_texts_concurrently, _run_async
+
+        embedder = Mock()
+        embedder.embed_batch = AsyncMock(side_effect=lambda batch: [[float(len(t))] for t in batch])
+
+        result = _run_async(_embed_texts_concurrently(embedder, ["a", "bb", "ccc"], 2, 2))
+
+        assert result == {"a": [1.0], "bb": [2.0], "ccc": [3.0]}
+        assert embedder.embed_batch.await_count == 2
+
+    def test_run_async_reuses_event_loop(self):
+        import asyncio
+
+        from autodoc.cli import _run_async
+
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        assert _run_async(current_loop()) is _run_async(current_loop())
+
+
+class TestCachedLoaders:
+    """Test the in-process SimpleAutodoc cache used by read-only commands"""
+
+    def test_autodoc_reused_until_cache_changes(self, monkeypatch):
+        from autodoc.cli import _autodoc
+
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        entity = {
+            "type": "function",
+            "name": "first",
+            "file_path": "src/a.py",
+            "line_number": 1,
+            "docstring": None,
+            "code": "def first():",
+        }
+
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            Path("autodoc_cache.json").write_text(json.dumps({"entities": [entity]}))
+            loaded = _autodoc()
+            assert _autodoc() is loaded
+
+            second = dict(entity, name="second")
+            Path("autodoc_cache.json").write_text(json.dumps({"entities": [entity, second]}))
+            reloaded = _autodoc()
+
+            assert reloaded is not loaded
+            assert [e.name for e in reloaded.entities] == ["first", "second"]
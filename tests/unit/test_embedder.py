@@ -7,7 +7,12 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from autodoc.embedder import OpenAIEmbedder
+from autodoc.embedder import (
+    OpenAIEmbedder,
+    dequantize_embedding,
+    normalize_embedding,
+    quantize_embedding,
+)
 
 
 class TestOpenAIEmbedder:
@@ -68,3 +73,34 @@ class TestOpenAIEmbedder:
             # Check that the request was made with truncated text
             call_args = mock_post.call_args[1]["json"]["input"]
             assert len(call_args) <= 8000
+
+
+class TestEmbeddingQuantization:
+    """Test int8 embedding quantization used by the cache"""
+
+    def test_quantize_round_trip(self):
+        embedding = [0.12, -0.5, 0.33, 0.0, 0.91]
+
+        quantized, scale = quantize_embedding(embedding)
+
+        assert all(-127 <= value <= 127 for value in quantized)
+        restored = dequantize_embedding(quantized, scale)
+        assert restored == pytest.approx(embedding, abs=scale)
+
+    def test_quantize_zero_vector(self):
+        quantized, scale = quantize_embedding([0.0, 0.0])
+
+        assert quantized == [0, 0]
+        assert dequantize_embedding(quantized, scale) == [0.0, 0.0]
+
+
+class TestEmbeddingNormalization:
+    """Test L2 normalization applied to embeddings at ingest"""
+
+    def test_normalize_unit_length(self):
+        normalized = normalize_embedding([3.0, 4.0])
+
+        assert normalized == pytest.approx([0.6, 0.8])
+
+    def test_normalize_zero_vector(self):
+        assert normalize_embedding([0.0, 0.0]) == [0.0, 0.0]
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Tests for the enrichment module
+"""
+
+import threading
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from autodoc.analyzer import CodeEntity, SimpleASTAnalyzer
+from autodoc.config import AutodocConfig, EnrichmentConfig
+from autodoc.enrichment import (
+    EnrichedEntity,
+    EnrichmentCache,
+    LLMEnricher,
+    adapt_enrichment,
+    code_fingerprint,
+    match_cached_duplicates,
+)
+
+
+def _entity(name, code, file_path="/test.py", line_number=1):
+    return CodeEntity(
+        type="function",
+        name=name,
+        file_path=file_path,
+        line_number=line_number,
+        docstring=None,
+        code=code,
+    )
+
+
+class TestEnrichmentCache:
+    """Test the journaled enrichment cache"""
+
+    def test_unsaved_enrichments_survive_via_journal(self, tmp_path):
+        cache_file = str(tmp_path / "cache.json")
+        cache = EnrichmentCache(cache_file)
+        cache.set_enrichment("a.py:f:1", {"description": "f"})
+        cache.set_enrichments({"a.py:g:2": {"description": "g"}})
+
+        # A new instance (e.g. after a crash) replays the journal
+        reloaded = EnrichmentCache(cache_file)
+        assert reloaded.get_enrichment("a.py:f:1") == {"description": "f"}
+        assert reloaded.get_enrichment("a.py:g:2") == {"description": "g"}
+        assert reloaded.dirty
+
+        reloaded.save_cache()
+        assert not (tmp_path / "cache.json.journal").exists()
+        assert EnrichmentCache(cache_file).key_set() == {"a.py:f:1", "a.py:g:2"}
+
+    def test_round_trip_without_orjson(self, tmp_path, monkeypatch):
+        """Test that the cache and journal round-trip through the stdlib json fallback"""
+        monkeypatch.setattr("autodoc.enrichment.ORJSON_AVAILABLE", False)
+        cache_file = str(tmp_path / "cache.json")
+        cache = EnrichmentCache(cache_file)
+        cache.set_enrichment("a.py:f:1", {"description": "f"})
+        assert EnrichmentCache(cache_file).get_enrichment("a.py:f:1") == {"description": "f"}
+
+        cache.save_cache()
+        assert EnrichmentCache(cache_file).get_enrichment("a.py:f:1") == {"description": "f"}
+
+    def test_save_while_adding_enrichments(self, tmp_path):
+        cache_file = str(tmp_path / "cache.json")
+        cache = EnrichmentCache(cache_file)
+
+        def add_enrichments():
+            for i in range(200):
+                cache.set_enrichment(f"a.py:f{i}:{i}", {"description": str(i)})
+
+        writer = threading.Thread(target=add_enrichments)
+        writer.start()
+        while writer.is_alive():
+            cache.save_cache()
+        writer.join()
+        cache.save_cache()
+
+        assert len(EnrichmentCache(cache_file).key_set()) == 200
+        assert not (tmp_path / "cache.json.journal").exists()
+
+    def test_journal_disabled(self, tmp_path):
+        cache = EnrichmentCache(str(tmp_path / "cache.json"), journal=False)
+        cache.set_enrichment("a.py:f:1", {"description": "f"})
+
+        assert not (tmp_path / "cache.json.journal").exists()
+
+
+class TestDuplicateReuse:
+    """Test reusing enrichments across entities with the same code"""
+
+    def test_fingerprint_ignores_name_and_whitespace(self):
+        first = _entity("load_users", "def load_users(path):\n    return read(path)")
+        second = _entity("load_orders", "def load_orders(path):  return read(path)")
+        different = _entity("load_items", "def load_items(path):\n    return parse(path)")
+
+        assert code_fingerprint(first) == code_fingerprint(second)
+        assert code_fingerprint(first) != code_fingerprint(different)
+        assert code_fingerprint(_entity("empty", "")) is None
+
+    def test_fingerprint_skips_signature_stubs(self):
+        assert code_fingerprint(_entity("load_users", "def load_users(...)")) is None
+        assert code_fingerprint(_entity("load_users", "def load_users(path, limit)")) is None
+
+    def test_analyzer_entities_match_on_real_source(self, tmp_path):
+        source = tmp_path / "loaders.py"
+        source.write_text(
+            "def load_users(path):\n"
+            "    return read(path)\n"
+            "\n"
+            "def load_orders(path):\n"
+            "    return read(path)\n"
+            "\n"
+            "def load_items(path):\n"
+            "    return parse(path)\n"
+        )
+        users, orders, items = SimpleASTAnalyzer().analyze_file(source)
+        enricher = LLMEnricher(AutodocConfig(enrichment=EnrichmentConfig(reuse_duplicates=True)))
+
+        unique, duplicates = enricher._split_duplicates([users, orders, items])
+
+        assert unique == [users, items]
+        assert duplicates == {id(users): [orders]}
+
+    def test_analyzer_entities_are_not_collapsed(self, sample_python_file):
+        entities = SimpleASTAnalyzer().analyze_file(sample_python_file)
+        enricher = LLMEnricher(AutodocConfig(enrichment=EnrichmentConfig(reuse_duplicates=True)))
+
+        unique, duplicates = enricher._split_duplicates(entities)
+
+        assert len(entities) > 1
+        assert unique == entities
+        assert duplicates == {}
+
+    def test_adapt_enrichment_renames_entity(self):
+        enrichment = {
+            "description": "load_users reads a file.",
+            "key_features": ["Calls load_users_fast", "load_users is pure"],
+            "complexity_notes": None,
+        }
+
+        adapted = adapt_enrichment(enrichment, "load_users", "load_orders")
+
+        assert adapted["description"] == "load_orders reads a file."
+        assert adapted["key_features"] == ["Calls load_users_fast", "load_orders is pure"]
+        assert adapted["complexity_notes"] is None
+
+    def test_match_cached_duplicates(self, tmp_path):
+        cache = EnrichmentCache(str(tmp_path / "cache.json"))
+        source = _entity("load_users", "def load_users(path):\n    return read(path)")
+        duplicate = _entity(
+            "load_orders", "def load_orders(path):\n    return read(path)", line_number=5
+        )
+        unrelated = _entity("other", "def other():\n    pass", line_number=9)
+        cache.set_enrichment(source.cache_key, {"description": "load_users reads a file."})
+
+        reused = match_cached_duplicates(
+            [duplicate, unrelated], [source, duplicate, unrelated], cache
+        )
+
+        assert reused == {duplicate.cache_key: {"description": "load_orders reads a file."}}
+
+    @pytest.mark.asyncio
+    async def test_enrich_entities_shares_duplicate_results(self, monkeypatch):
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        first = _entity("load_users", "def load_users(path):\n    return read(path)")
+        second = _entity(
+            "load_orders", "def load_orders(path):\n    return read(path)", line_number=5
+        )
+
+        async def fake_single(entity, context=None):
+            return EnrichedEntity(
+                entity=entity,
+                description=f"{entity.name} reads a file.",
+                purpose="Loading",
+                key_features=[],
+            )
+
+        enricher = LLMEnricher(AutodocConfig(enrichment=EnrichmentConfig(reuse_duplicates=True)))
+        fake = AsyncMock(side_effect=fake_single)
+        with patch.object(enricher, "_enrich_single", fake) as single:
+            enriched = await enricher.enrich_entities([first, second])
+
+        assert single.call_count == 1
+        assert [(e.entity.name, e.description) for e in enriched] == [
+            ("load_users", "load_users reads a file."),
+            ("load_orders", "load_orders reads a file."),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_enrich_entities_as_completed_yields_every_entity(self, monkeypatch):
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        first = _entity("load_users", "def load_users(path):\n    return read(path)")
+        second = _entity(
+            "load_orders", "def load_orders(path):\n    return read(path)", line_number=5
+        )
+        failing = _entity("other", "def other():\n    pass", line_number=9)
+
+        async def fake_single(entity, context=None):
+            if entity is failing:
+                raise RuntimeError("boom")
+            return EnrichedEntity(
+                entity=entity,
+                description=f"{entity.name} reads a file.",
+                purpose="Loading",
+                key_features=[],
+            )
+
+        enricher = LLMEnricher(AutodocConfig(enrichment=EnrichmentConfig(reuse_duplicates=True)))
+        with patch.object(enricher, "_enrich_single", AsyncMock(side_effect=fake_single)):
+            results = {
+                entity.name: enriched.description if enriched else None
+                async for entity, enriched in enricher.enrich_entities_as_completed(
+                    [first, second, failing]
+                )
+            }
+
+        assert results == {
+            "load_users": "load_users reads a file.",
+            "load_orders": "load_orders reads a file.",
+            "other": None,
+        }